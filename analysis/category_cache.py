@@ -0,0 +1,152 @@
+"""
+Category Cache - Shared LRU cache of categories by normalized transaction description
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterable
+
+from utils.file_utils import atomic_write
+
+# Default number of (description, income flag) entries kept per worker
+DEFAULT_MAX_ENTRIES = 100000
+
+# Bump when the layout of the persisted cache file changes
+CACHE_FORMAT_VERSION = 1
+
+# Cache key: (category fingerprint, normalized description, positive amount)
+CacheKey = Tuple[str, str, bool]
+
+
+class CategoryCache:
+    """Bounded LRU cache of categories, keyed by the category set's fingerprint and the description"""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the category cache
+        
+        Args:
+            max_entries: Maximum number of cached descriptions; least recently used ones are evicted
+            path: Optional JSON file the cache is loaded from now and written to by save()
+        """
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        
+        # Cached categories, most recently used last
+        self._entries: 'OrderedDict[CacheKey, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if self.path is not None:
+            self.load()
+    
+    def get_many(self, keys: List[CacheKey]) -> List[Optional[str]]:
+        """
+        Look up several keys, counting hits and misses
+        
+        Args:
+            keys: Cache keys
+        
+        Returns:
+            Cached category of each key, or None on a miss
+        """
+        categories = []
+        with self._lock:
+            for key in keys:
+                category = self._entries.get(key)
+                if category is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                categories.append(category)
+        return categories
+    
+    def put_many(self, items: Iterable[Tuple[CacheKey, str]]) -> None:
+        """Store categories, evicting the least recently used entries beyond max_entries"""
+        with self._lock:
+            for key, category in items:
+                self._entries[key] = category
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, fingerprint: Optional[str] = None) -> None:
+        """
+        Drop cached categories
+        
+        Args:
+            fingerprint: Only drop the entries of this category set (all entries if None)
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == fingerprint]:
+                del self._entries[key]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters of the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def load(self) -> None:
+        """Read the persisted entries from path, keeping the most recently used ones"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, OSError, ValueError):
+            return
+        
+        if data.get('version') != CACHE_FORMAT_VERSION:
+            return
+        
+        self.put_many(
+            ((fingerprint, description, bool(income)), category)
+            for fingerprint, description, income, category in data.get('entries', [])
+        )
+    
+    def save(self) -> None:
+        """Write the entries to path (least recently used first), if persistence is enabled"""
+        if self.path is None:
+            return
+        
+        with self._lock:
+            entries = [[*key, category] for key, category in self._entries.items()]
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with atomic_write(self.path) as f:
+                json.dump({'version': CACHE_FORMAT_VERSION, 'entries': entries}, f)
+        except Exception as e:
+            print(f"Warning: Failed to write category cache: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache shared by all analyzers of the process (e.g. one web worker)
+_shared_cache: Optional[CategoryCache] = None
+
+
+def shared_cache() -> CategoryCache:
+    """Return the process-wide category cache, creating an in-memory one on first use"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = CategoryCache()
+    return _shared_cache
+
+
+def set_shared_cache(cache: CategoryCache) -> None:
+    """Replace the process-wide category cache (e.g. with one persisted to disk)"""
+    global _shared_cache
+    _shared_cache = cache
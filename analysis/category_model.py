@@ -0,0 +1,273 @@
+"""
+Category Model - Pre-fitted TF-IDF model of the spending category keywords
+
+Usage:
+    python -m analysis.category_model
+    python -m analysis.category_model --categories data/category_mapping.json --output analysis/models
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import List, Dict, Union, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from utils.file_utils import atomic_write
+
+
+# Bump when the artifact layout or the vectorizer settings change
+MODEL_VERSION = '1'
+
+# Default location of the serialized models, one subdirectory per category set
+DEFAULT_MODEL_DIR = Path(__file__).resolve().parent / 'models'
+
+# Length of the fingerprint prefix naming a model's subdirectory
+ARTIFACT_NAME_LENGTH = 16
+
+# Settings of the TF-IDF vectorizer fitted on the category keywords
+VECTORIZER_PARAMS = {
+    'lowercase': True,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'max_features': 5000
+}
+
+# Array files of the artifact, loaded memory-mapped
+ARRAY_FILES = ['vocabulary', 'idf', 'data', 'indices', 'indptr']
+
+# Numeric tokens (reference numbers, amounts) and the token that stands in for all of them
+NUMBER_TOKEN = r'\b\d{2,}\b'
+NUMBER_PLACEHOLDER = '00'
+
+
+class CategoryModel:
+    """TF-IDF vectorizer and category keyword matrix used to categorize descriptions"""
+    
+    def __init__(self, vectorizer: TfidfVectorizer, category_vectors: sp.csr_matrix, category_names: List[str], fingerprint: str):
+        """
+        Initialize a category model
+        
+        Args:
+            vectorizer: Fitted TF-IDF vectorizer
+            category_vectors: One TF-IDF row per category
+            category_names: Category of each row of category_vectors
+            fingerprint: Fingerprint of the categories the model was fitted on
+        """
+        self.vectorizer = vectorizer
+        self.category_vectors = category_vectors
+        self.category_names = category_names
+        self.fingerprint = fingerprint
+        
+        # Numbers only split n-grams unless a keyword contains one; then they must be kept as they are
+        self.mask_numbers = not any(
+            token.isdigit() for term in vectorizer.vocabulary_ for token in term.split()
+        )
+    
+    @classmethod
+    def fit(cls, categories: Dict[str, List[str]]) -> Optional['CategoryModel']:
+        """
+        Fit the vectorizer on the category keywords
+        
+        Args:
+            categories: Keywords of each category
+        
+        Returns:
+            CategoryModel, or None if no category has keywords
+        """
+        category_keywords = {category: ' '.join(keywords) for category, keywords in categories.items() if keywords}
+        if not category_keywords:
+            return None
+        
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        category_vectors = vectorizer.fit_transform(category_keywords.values()).tocsr()
+        return cls(vectorizer, category_vectors, list(category_keywords), category_fingerprint(categories))
+    
+    @classmethod
+    def load(cls, categories: Dict[str, List[str]], model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> Optional['CategoryModel']:
+        """
+        Load a serialized model, memory-mapping its arrays
+        
+        Args:
+            categories: Keywords of each category the model must have been fitted on
+            model_dir: Directory passed to save
+        
+        Returns:
+            CategoryModel, or None if there is no artifact or it does not match
+            the categories, model version or scikit-learn version
+        """
+        fingerprint = category_fingerprint(categories)
+        model_dir = artifact_dir(model_dir, fingerprint)
+        try:
+            with open(model_dir / 'metadata.json') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if (metadata.get('model_version') != MODEL_VERSION
+                or metadata.get('sklearn_version') != sklearn.__version__
+                or metadata.get('fingerprint') != fingerprint):
+            return None
+        
+        try:
+            arrays = {name: np.load(model_dir / f'{name}.npy', mmap_mode='r') for name in ARRAY_FILES}
+        except (OSError, ValueError):
+            return None
+        
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        vectorizer.vocabulary_ = {term: i for i, term in enumerate(arrays['vocabulary'].tolist())}
+        vectorizer.idf_ = arrays['idf']
+        
+        category_vectors = sp.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=tuple(metadata['shape'])
+        )
+        return cls(vectorizer, category_vectors, metadata['category_names'], metadata['fingerprint'])
+    
+    @classmethod
+    def load_or_fit(cls, categories: Dict[str, List[str]], model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> Optional['CategoryModel']:
+        """Load the serialized model if it matches the categories, otherwise fit one"""
+        return cls.load(categories, model_dir) or cls.fit(categories)
+    
+    def top_categories(self, descriptions: Sequence[str], threshold: float) -> np.ndarray:
+        """
+        Find the most similar category of each description
+        
+        Description and category vectors are both L2-normalized, so their
+        sparse product is the cosine similarity; no dense N x C matrix is
+        built. Each distinct description is vectorized once; numbers are
+        masked first (when no keyword contains one), so descriptions that
+        only differ in a reference number count as one.
+        
+        Args:
+            descriptions: Transaction descriptions
+            threshold: Similarity a category must exceed to be assigned
+        
+        Returns:
+            Array with the index in category_names of each description's
+            category, or -1 where no category is similar enough
+        """
+        text = pd.Series(descriptions, dtype=object).astype(str).str.lower()
+        if self.mask_numbers:
+            text = text.str.replace(NUMBER_TOKEN, NUMBER_PLACEHOLDER, regex=True)
+        
+        codes, uniques = pd.factorize(text)
+        if len(uniques) == 0:
+            return np.full(len(codes), -1, dtype=np.int64)
+        
+        similarities = (self.vectorizer.transform(uniques.tolist()) @ self.category_vectors.T).tocsr()
+        similarities.sort_indices()
+        
+        return _row_argmax(similarities, threshold)[codes]
+    
+    def save(self, model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> None:
+        """
+        Serialize the model as .npy arrays plus a metadata file
+        
+        Models of different category sets are kept side by side, each in a
+        subdirectory named after its fingerprint.
+        
+        Args:
+            model_dir: Output directory (created if needed)
+        """
+        model_dir = artifact_dir(model_dir, self.fingerprint)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Invalidate the current artifact while its arrays are replaced
+        (model_dir / 'metadata.json').unlink(missing_ok=True)
+        
+        vocabulary = sorted(self.vectorizer.vocabulary_, key=self.vectorizer.vocabulary_.get)
+        arrays = {
+            'vocabulary': np.array(vocabulary, dtype=str),
+            'idf': np.asarray(self.vectorizer.idf_),
+            'data': self.category_vectors.data,
+            'indices': self.category_vectors.indices,
+            'indptr': self.category_vectors.indptr
+        }
+        for name, array in arrays.items():
+            np.save(model_dir / f'{name}.npy', array, allow_pickle=False)
+        
+        metadata = {
+            'model_version': MODEL_VERSION,
+            'sklearn_version': sklearn.__version__,
+            'fingerprint': self.fingerprint,
+            'category_names': self.category_names,
+            'shape': list(self.category_vectors.shape)
+        }
+        
+        # The metadata is written last, so a partly written artifact is never loaded
+        with atomic_write(model_dir / 'metadata.json') as f:
+            json.dump(metadata, f, indent=2)
+
+
+def _row_argmax(matrix: sp.csr_matrix, threshold: float) -> np.ndarray:
+    """
+    Column of each row's largest value (the first on ties), or -1 if it does not exceed the threshold
+    
+    Works on the stored values only, so the cost is linear in the number of
+    non-zeros. The matrix must have sorted indices and non-negative values.
+    """
+    lengths = np.diff(matrix.indptr)
+    best = np.full(matrix.shape[0], -1, dtype=np.int64)
+    
+    rows = np.flatnonzero(lengths)
+    if len(rows) == 0:
+        return best
+    
+    row_max = np.maximum.reduceat(matrix.data, matrix.indptr[rows])
+    
+    # Positions holding their row's maximum; np.unique keeps the first one per row
+    row_of = np.repeat(np.arange(matrix.shape[0]), lengths)
+    at_max = np.flatnonzero(matrix.data == np.repeat(row_max, lengths[rows]))
+    max_rows, first = np.unique(row_of[at_max], return_index=True)
+    best[max_rows] = matrix.indices[at_max[first]]
+    
+    scores = np.zeros(matrix.shape[0])
+    scores[rows] = row_max
+    best[scores <= threshold] = -1
+    return best
+
+
+def category_fingerprint(categories: Dict[str, List[str]]) -> str:
+    """Hash of the category keywords and vectorizer settings a model is fitted on"""
+    payload = json.dumps(
+        {'categories': categories, 'params': VECTORIZER_PARAMS, 'version': MODEL_VERSION},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def artifact_dir(model_dir: Union[str, Path], fingerprint: str) -> Path:
+    """Directory holding the model of one category set"""
+    return Path(model_dir) / fingerprint[:ARTIFACT_NAME_LENGTH]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fit and serialize the spending category model")
+    parser.add_argument('--categories', type=str, help="Custom categories JSON merged into the defaults")
+    parser.add_argument('--output', type=str, default=str(DEFAULT_MODEL_DIR), help="Output directory")
+    args = parser.parse_args(argv)
+    
+    # Resolve the categories exactly as the analyzer does at runtime
+    from analysis.spending_analyzer import SpendingAnalyzer
+    
+    categories = SpendingAnalyzer.resolve_categories(args.categories)
+    model = CategoryModel.fit(categories)
+    if model is None:
+        print("Error: No category has keywords", file=sys.stderr)
+        return 1
+    
+    model.save(args.output)
+    print(f"Category model ({len(model.category_names)} categories, "
+          f"{len(model.vectorizer.vocabulary_)} terms) written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Dedup - Hash index for dropping transactions repeated across overlapping statements
+"""
+
+import re
+import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Hashable, Iterable, Tuple
+
+import pandas as pd
+
+
+# Characters removed when normalizing descriptions for matching
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+class DedupIndex:
+    """
+    Index of kept transactions keyed by (description, amount) and date bucket
+    
+    Lookups only touch the buckets around a transaction's date, so each
+    transaction costs O(1) on average and a run over N rows is O(N).
+    """
+    
+    def __init__(self, date_window_days: int = 0):
+        """
+        Initialize the dedup index
+        
+        Args:
+            date_window_days: Maximum number of days two copies of a transaction may
+                              be apart (e.g. 2 when one export uses the posting date)
+        """
+        if date_window_days < 0:
+            raise ValueError("date_window_days must not be negative")
+        
+        self.date_window_days = date_window_days
+        self.duplicates = 0
+        
+        # (description, cents) -> date bucket -> kept entries of (day, source, entry id)
+        self._index: Dict[Tuple[str, int], Dict[int, List[Tuple[int, Any, int]]]] = {}
+        self._kept = 0
+        
+        # (entry id, source) pairs: each kept entry absorbs at most one copy per other source
+        self._matched = set()
+    
+    def add(self, transaction: Dict[str, Any], source: Optional[Hashable] = None) -> bool:
+        """
+        Add a transaction unless it duplicates one already in the index
+        
+        With a source (e.g. the statement file), a transaction only matches
+        entries from other sources, and each entry is matched at most once per
+        source; identical transactions within one statement are all kept.
+        Without a source, any earlier copy within the window is a duplicate.
+        
+        Args:
+            transaction: Transaction dictionary with date, description and amount
+            source: Identifier of the statement the transaction comes from
+        
+        Returns:
+            True if the transaction was kept, False if it is a duplicate
+        """
+        description, cents, day = transaction_key(transaction)
+        if day is None:
+            return True
+        
+        buckets = self._index.get((description, cents))
+        if buckets is None:
+            buckets = self._index[(description, cents)] = {}
+        
+        bucket = day // (self.date_window_days + 1)
+        
+        # Copies within the window can only sit in this bucket or its neighbours
+        for key in self._neighbours(bucket):
+            for entry_day, entry_source, entry_id in buckets.get(key, ()):
+                if abs(entry_day - day) > self.date_window_days:
+                    continue
+                if source is None:
+                    self.duplicates += 1
+                    return False
+                if entry_source != source and (entry_id, source) not in self._matched:
+                    self._matched.add((entry_id, source))
+                    self.duplicates += 1
+                    return False
+        
+        # Entries are flat tuples so the garbage collector can skip them on large runs
+        buckets.setdefault(bucket, []).append((day, source, self._kept))
+        self._kept += 1
+        return True
+    
+    def filter(
+        self,
+        transactions: Iterable[Dict[str, Any]],
+        source: Optional[Hashable] = None,
+        source_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keep the transactions that are not duplicates, adding them to the index
+        
+        Args:
+            transactions: Transaction dictionaries
+            source: Identifier of the statement the transactions come from
+            source_key: Optional transaction key naming a transaction's own statement;
+                        source is used for transactions that do not name one
+        
+        Returns:
+            List of kept transactions in their original order
+        """
+        return [
+            transaction for transaction in transactions
+            if self.add(transaction, (source_key and transaction.get(source_key)) or source)
+        ]
+    
+    def _neighbours(self, bucket: int) -> Tuple[int, ...]:
+        # Exact-date matching never needs the neighbouring buckets
+        if self.date_window_days == 0:
+            return (bucket,)
+        return (bucket, bucket - 1, bucket + 1)
+    
+    def __len__(self) -> int:
+        return self._kept
+
+
+def deduplicate(
+    transactions: List[Dict[str, Any]],
+    date_window_days: int = 0,
+    source_key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Drop duplicate transactions as a pipeline stage before analysis
+    
+    Args:
+        transactions: Transaction dictionaries
+        date_window_days: Maximum number of days between two copies of a transaction
+        source_key: Optional transaction key naming the statement each transaction
+                    comes from; repeats within one statement are then kept
+    
+    Returns:
+        List of kept transactions in their original order
+    """
+    return DedupIndex(date_window_days).filter(transactions, source_key=source_key)
+
+
+def transaction_key(transaction: Dict[str, Any]) -> Tuple[str, int, Optional[int]]:
+    """
+    Matching key of a transaction
+    
+    Args:
+        transaction: Transaction dictionary
+    
+    Returns:
+        Tuple of (normalized description, amount in cents, date as a day number or None)
+    """
+    date = transaction.get('date')
+    if date is None or date is pd.NaT:
+        day = None
+    elif isinstance(date, datetime.date):
+        # Covers datetime and pandas Timestamp too
+        day = date.toordinal()
+    elif not pd.isna(date):
+        day = pd.Timestamp(date).toordinal()
+    else:
+        day = None
+    
+    return (
+        normalize_description(transaction.get('description', '')),
+        int(round(float(transaction.get('amount', 0.0)) * 100)),
+        day
+    )
+
+
+@lru_cache(maxsize=65536)
+def _normalize_text(description: str) -> str:
+    return _NON_ALNUM.sub(' ', description.lower()).strip()
+
+
+def normalize_description(description: Any) -> str:
+    """Lowercase a description and collapse punctuation and whitespace"""
+    return _normalize_text(str(description))
@@ -0,0 +1,105 @@
+"""
+Keyword Matcher - Aho-Corasick automaton over the category keywords
+"""
+
+from collections import deque
+from typing import List, Dict, Optional
+
+
+class KeywordMatcher:
+    """Finds the categories whose keywords occur in a description in a single pass"""
+    
+    def __init__(self, categories: Dict[str, List[str]]):
+        """
+        Compile the keywords of every category into one automaton
+        
+        Keywords are matched case-insensitively as substrings, like
+        `keyword.lower() in description.lower()`. A keyword listed under
+        several categories reports all of them.
+        
+        Args:
+            categories: Keywords of each category, in priority order
+        """
+        self.category_names = list(categories)
+        self._category_bits = {category: 1 << i for i, category in enumerate(self.category_names)}
+        
+        # Trie of the lower-cased keywords; outputs are bitmasks of category indices
+        transitions: List[Dict[str, int]] = [{}]
+        outputs = [0]
+        for category, keywords in categories.items():
+            bit = self._category_bits[category]
+            for keyword in keywords:
+                state = 0
+                for char in keyword.lower():
+                    next_state = transitions[state].get(char)
+                    if next_state is None:
+                        next_state = len(transitions)
+                        transitions[state][char] = next_state
+                        transitions.append({})
+                        outputs.append(0)
+                    state = next_state
+                outputs[state] |= bit
+        
+        # Resolve failure links breadth-first into a full transition table, so
+        # matching takes exactly one lookup per character
+        self._transitions: List[Dict[str, int]] = [dict(transitions[0])] + [{} for _ in transitions[1:]]
+        failure = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self._transitions[failure[state]]
+            outputs[state] |= outputs[failure[state]]
+            
+            resolved = dict(fallback)
+            for char, next_state in transitions[state].items():
+                # The longest proper suffix of the next state's string that is in the trie
+                failure[next_state] = fallback.get(char, 0)
+                resolved[char] = next_state
+                queue.append(next_state)
+            self._transitions[state] = resolved
+        
+        self._outputs = outputs
+    
+    def match_mask(self, description: str) -> int:
+        """
+        Bitmask of the categories with a keyword in the description
+        
+        Args:
+            description: Text to search (lower-cased here)
+        
+        Returns:
+            Integer whose bit i is set if category_names[i] has a matching keyword
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        hits = outputs[0]
+        for char in description.lower():
+            state = transitions[state].get(char, 0)
+            hits |= outputs[state]
+        return hits
+    
+    def matches(self, description: str) -> List[str]:
+        """Categories with a keyword in the description, in priority order"""
+        hits = self.match_mask(description)
+        return [category for category, bit in self._category_bits.items() if hits & bit]
+    
+    def first_match(self, description: str, preferred: Optional[str] = None) -> Optional[str]:
+        """
+        Highest-priority category with a keyword in the description
+        
+        Args:
+            description: Text to search
+            preferred: Category returned if it matches, ahead of the priority order
+        
+        Returns:
+            Category name, or None if no keyword occurs in the description
+        """
+        hits = self.match_mask(description)
+        if not hits:
+            return None
+        if preferred is not None and hits & self._category_bits.get(preferred, 0):
+            return preferred
+        
+        # The lowest set bit is the first category in priority order
+        return self.category_names[(hits & -hits).bit_length() - 1]
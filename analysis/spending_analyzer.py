@@ -7,27 +7,52 @@ import json
 import datetime
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterable, Hashable
 from collections import defaultdict
 
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 
-# Download NLTK resources if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-    
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+from parsers.transaction_batch import TransactionBatch
+from analysis.dedup import DedupIndex
+from analysis.category_model import (
+    CategoryModel, DEFAULT_MODEL_DIR, NUMBER_TOKEN, NUMBER_PLACEHOLDER, category_fingerprint
+)
+from analysis.category_cache import CategoryCache, shared_cache
+from analysis.keyword_matcher import KeywordMatcher
+
+# Minimum cosine similarity between a description and a category's keywords to assign the category
+SIMILARITY_THRESHOLD = 0.1
+
+# Transaction key naming the statement a transaction comes from, used by deduplication
+SOURCE_KEY = 'source'
+
+# Source of transactions that do not name one; they all count as one statement
+DEFAULT_SOURCE = 'statement'
+
+# Cadences of recurring expenses: (frequency, minimum and maximum average days between charges)
+RECURRENCE_PERIODS = [
+    ('weekly', 6, 8),
+    ('biweekly', 13, 16),
+    ('monthly', 25, 35),
+    ('quarterly', 85, 95),
+    ('semiannual', 175, 190),
+    ('yearly', 350, 380)
+]
+
+# Reference numbers, dates and amounts removed from descriptions before grouping,
+# each with a character any match contains (cheaper to test than the pattern)
+DESCRIPTION_NOISE = [
+    (re.compile(r'#\d+'), '#'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}'), '-'),
+    (re.compile(r'\d+\.\d+'), '.')
+]
+
+# Common transaction words removed from descriptions before grouping
+COMMON_TRANSACTION_WORDS = ['payment', 'purchase', 'transaction', 'debit', 'credit']
+
+# Nanoseconds per day, to turn datetime64 differences into whole days
+NS_PER_DAY = 24 * 60 * 60 * 10**9
 
 
 class SpendingAnalyzer:
@@ -56,55 +81,198 @@ class SpendingAnalyzer:
         'other': []  # Catch-all category
     }
     
-    def __init__(self, custom_categories_path: Optional[str] = None):
+    def __init__(
+        self,
+        custom_categories_path: Optional[str] = None,
+        dedup_window_days: Optional[int] = None,
+        model_dir: Union[str, Path] = DEFAULT_MODEL_DIR,
+        category_cache: Optional[CategoryCache] = None
+    ):
         """
         Initialize the spending analyzer
         
         Args:
             custom_categories_path: Optional path to a JSON file with custom categories
+            dedup_window_days: If set, drop duplicate transactions (same description and
+                               amount within this many days) from different sources
+                               (statements) before analysis; repeats within one source are kept
+            model_dir: Directory of the category model built by `python -m analysis.category_model`
+            category_cache: Cache of categories by description (defaults to the process-wide cache)
         """
+        self.dedup_window_days = dedup_window_days
+        
         # Load categories
-        self.categories = self.DEFAULT_CATEGORIES.copy()
+        self.categories = self.resolve_categories(custom_categories_path)
+        
+        # Keyword rules are compiled once into a single automaton
+        self.keyword_matcher = KeywordMatcher(self.categories)
+        
+        # Cached categories are only reused for the same category set
+        self.category_cache = category_cache if category_cache is not None else shared_cache()
+        self.fingerprint = category_fingerprint(self.categories)
+        
+        # Load the pre-fitted TF-IDF model of the category keywords; it is only
+        # fitted here if no artifact was built for these categories
+        self.model = model = CategoryModel.load_or_fit(self.categories, model_dir)
+        if model is not None:
+            self.vectorizer = model.vectorizer
+            self.category_vectors = model.category_vectors
+            self.category_names = model.category_names
+        else:
+            self.vectorizer = None
+            self.category_vectors = None
+            self.category_names = []
+    
+    @classmethod
+    def resolve_categories(cls, custom_categories_path: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Build the category keywords: the defaults merged with optional custom categories
+        
+        Args:
+            custom_categories_path: Optional path to a JSON file with custom categories
+        
+        Returns:
+            Dictionary mapping each category to its keywords
+        """
+        # Copy the keyword lists so merging never changes the class defaults
+        categories = {category: list(keywords) for category, keywords in cls.DEFAULT_CATEGORIES.items()}
         
         # Load custom categories if provided
         if custom_categories_path:
-            self._load_custom_categories(custom_categories_path)
-        
-        # Initialize TFIDF vectorizer for text similarity
-        self.vectorizer = TfidfVectorizer(
-            lowercase=True,
-            stop_words='english',
-            ngram_range=(1, 2),
-            max_features=5000
-        )
-        
-        # Prepare category keywords for vectorization
-        self.category_keywords = {}
-        for category, keywords in self.categories.items():
-            if keywords:
-                self.category_keywords[category] = ' '.join(keywords)
+            cls._load_custom_categories(categories, custom_categories_path)
         
-        # Vectorize category keywords
-        if self.category_keywords:
-            self.category_vectors = self.vectorizer.fit_transform(self.category_keywords.values())
-            self.category_names = list(self.category_keywords.keys())
-        else:
-            self.category_vectors = None
-            self.category_names = []
+        return categories
     
-    def analyze(self, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze(self, transactions: List[Dict[str, Any]], source: Optional[Hashable] = None) -> Dict[str, Any]:
         """
         Analyze transactions and categorize spending
         
         Args:
             transactions: List of transaction dictionaries
+            source: Statement of the transactions that do not name one under SOURCE_KEY
             
         Returns:
             Dictionary with spending analysis results
         """
+        # Drop transactions repeated by overlapping statements
+        dedup_index = self._dedup_index()
+        if dedup_index is not None:
+            transactions = self._deduplicate(dedup_index, transactions, source)
+        
         # Categorize transactions
         categorized_transactions = self._categorize_transactions(transactions)
         
+        return self._summarize(categorized_transactions, source)
+    
+    def analyze_batches(self, batches: Iterable[TransactionBatch], source: Optional[Hashable] = None) -> Dict[str, Any]:
+        """
+        Analyze a stream of transaction batches, e.g. from BaseParser.iter_parse
+        
+        Each batch is categorized as it arrives, so only one batch needs to be
+        converted to transaction dictionaries at a time.
+        
+        Args:
+            batches: Iterable of TransactionBatch objects
+            source: Statement of the transactions that do not name one under SOURCE_KEY
+        
+        Returns:
+            Dictionary with spending analysis results
+        """
+        # One index spans all batches, so copies from other sources in different batches are caught
+        dedup_index = self._dedup_index()
+        
+        categorized_transactions = []
+        for batch in batches:
+            # Categorize as a column first, so the dictionaries are built with their category
+            transactions = self.categorize_batch(batch).to_dicts()
+            if dedup_index is not None:
+                transactions = self._deduplicate(dedup_index, transactions, source)
+            categorized_transactions.extend(transactions)
+        
+        return self._summarize(categorized_transactions, source)
+    
+    def append(
+        self,
+        analysis: Dict[str, Any],
+        transactions: List[Dict[str, Any]],
+        source: Optional[Hashable] = None
+    ) -> Dict[str, Any]:
+        """
+        Extend earlier analysis results with newly appended transactions
+        
+        Only the new transactions are categorized; the summaries are rebuilt
+        over the earlier categorized transactions plus the new ones.
+        
+        Args:
+            analysis: Results of analyze (or of an earlier append)
+            transactions: Transactions appended to the statement since then
+            source: Statement of the new transactions that do not name one under SOURCE_KEY
+                    (by default the same statement as the earlier transactions)
+        
+        Returns:
+            Dictionary with spending analysis results for all transactions
+        """
+        previous = analysis['transactions']
+        previous_source = analysis.get('source')
+        
+        # The earlier transactions are already deduplicated; index them under the source
+        # analyze used, so copies among the new ones are caught
+        dedup_index = self._dedup_index()
+        if dedup_index is not None:
+            self._deduplicate(dedup_index, previous, previous_source)
+            transactions = self._deduplicate(
+                dedup_index, transactions, source if source is not None else previous_source
+            )
+        
+        return self._summarize(previous + self._categorize_transactions(transactions), previous_source)
+    
+    def categorize_batch(self, batch: TransactionBatch) -> TransactionBatch:
+        """
+        Write a category column into a batch of transactions
+        
+        Categories already present in the batch are kept.
+        
+        Args:
+            batch: TransactionBatch to categorize in place
+        
+        Returns:
+            The same batch
+        """
+        if 'category' in batch.frame:
+            categories = batch.frame['category'].to_numpy(dtype=object, copy=True)
+            missing = pd.isna(categories)
+        else:
+            categories = np.empty(len(batch), dtype=object)
+            missing = np.ones(len(batch), dtype=bool)
+        
+        categories[missing] = self._assign_categories(
+            batch.descriptions[missing].tolist(),
+            batch.amounts[missing].to_numpy()
+        )
+        batch.frame['category'] = categories
+        return batch
+    
+    def _dedup_index(self) -> Optional[DedupIndex]:
+        """Create a fresh dedup index if deduplication is enabled"""
+        if self.dedup_window_days is None:
+            return None
+        return DedupIndex(self.dedup_window_days)
+    
+    @staticmethod
+    def _deduplicate(
+        dedup_index: DedupIndex,
+        transactions: List[Dict[str, Any]],
+        source: Optional[Hashable] = None
+    ) -> List[Dict[str, Any]]:
+        """Keep the transactions that do not repeat one from another source"""
+        return dedup_index.filter(transactions, source if source is not None else DEFAULT_SOURCE, SOURCE_KEY)
+    
+    def _summarize(
+        self,
+        categorized_transactions: List[Dict[str, Any]],
+        source: Optional[Hashable] = None
+    ) -> Dict[str, Any]:
+        """Build the analysis results from categorized transactions (source is kept for append)"""
         # Group transactions by category
         category_spending = defaultdict(list)
         for transaction in categorized_transactions:
@@ -144,13 +312,15 @@ class SpendingAnalyzer:
             'net_cash_flow': income - expenses,
             'savings_rate': (income - expenses) / income if income > 0 else 0,
             'top_spending_categories': self._get_top_spending_categories(spending_by_category, 5),
-            'top_merchants': self._get_top_merchants(categorized_transactions, 5)
+            'top_merchants': self._get_top_merchants(categorized_transactions, 5),
+            'source': source
         }
         
         return analysis_results
     
-    def _load_custom_categories(self, custom_categories_path: str) -> None:
-        """Load custom categories from a JSON file"""
+    @staticmethod
+    def _load_custom_categories(categories: Dict[str, List[str]], custom_categories_path: str) -> None:
+        """Load custom categories from a JSON file into a category dictionary"""
         try:
             with open(custom_categories_path, 'r') as f:
                 custom_categories = json.load(f)
@@ -158,84 +328,127 @@ class SpendingAnalyzer:
             # Validate and merge custom categories
             for category, keywords in custom_categories.items():
                 if isinstance(keywords, list):
-                    if category in self.categories:
+                    if category in categories:
                         # Merge with existing category
-                        self.categories[category].extend(keywords)
+                        categories[category].extend(keywords)
                     else:
                         # Add new category
-                        self.categories[category] = keywords
+                        categories[category] = keywords
         except Exception as e:
             print(f"Warning: Failed to load custom categories: {e}")
     
     def _categorize_transactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Categorize transactions based on their descriptions"""
-        categorized_transactions = []
+        """Categorize transactions based on their descriptions, returning categorized copies"""
+        categorized_transactions = [transaction.copy() for transaction in transactions]
+        
+        # Transactions that already have a category keep it
+        uncategorized = [t for t in categorized_transactions if 'category' not in t]
+        categories = self._assign_categories(
+            [t['description'] for t in uncategorized],
+            np.array([t['amount'] for t in uncategorized], dtype=float)
+        )
+        for transaction, category in zip(uncategorized, categories.tolist()):
+            transaction['category'] = category
         
-        # Extract descriptions for vectorization
-        descriptions = [t['description'].lower() for t in transactions]
+        return categorized_transactions
+    
+    def _assign_categories(self, descriptions: List[str], amounts: np.ndarray) -> np.ndarray:
+        """
+        Pick the category of each description, reusing cached categories
+        
+        Descriptions are normalized (lower-cased, numbers masked) and each
+        distinct (description, positive amount) pair is looked up in the
+        category cache once; only the misses are scored.
+        
+        Args:
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts, aligned with descriptions
+        
+        Returns:
+            Object array of category names
+        """
+        if not descriptions:
+            return np.empty(0, dtype=object)
+        
+        # The cache key masks numbers exactly when the model's preprocessing does
+        # (without a model no category has keywords, so numbers never matter)
+        text = pd.Series(descriptions, dtype=object).astype(str).str.lower()
+        if self.model is None or self.model.mask_numbers:
+            text = text.str.replace(NUMBER_TOKEN, NUMBER_PLACEHOLDER, regex=True)
+        
+        # Only the sign of the amount matters (income keywords are checked first for deposits)
+        text_codes, texts = pd.factorize(text)
+        pair_codes, inverse = np.unique(text_codes * 2 + (np.asarray(amounts) > 0), return_inverse=True)
+        texts = texts.tolist()
+        keys = [
+            (self.fingerprint, texts[code // 2], bool(code % 2))
+            for code in pair_codes.tolist()
+        ]
+        
+        categories = np.array(self.category_cache.get_many(keys), dtype=object)
+        misses = np.flatnonzero(pd.isna(categories))
+        if len(misses):
+            # Any description with the key gets the same category, so the key itself is scored
+            scored = self._score_categories(
+                [keys[i][1] for i in misses.tolist()],
+                np.array([1.0 if keys[i][2] else 0.0 for i in misses.tolist()])
+            )
+            categories[misses] = scored
+            self.category_cache.put_many(zip([keys[i] for i in misses.tolist()], scored.tolist()))
+        
+        return categories[inverse.ravel()]
+    
+    def _score_categories(self, descriptions: List[str], amounts: np.ndarray) -> np.ndarray:
+        """
+        Pick the category of each description without the cache
+        
+        The most similar category by TF-IDF is assigned in one vectorized
+        pass; descriptions below SIMILARITY_THRESHOLD fall back to the
+        keyword rules.
+        
+        Args:
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts, aligned with descriptions
         
-        # Vectorize descriptions if we have category vectors
-        if self.category_vectors is not None and descriptions:
+        Returns:
+            Object array of category names
+        """
+        categories = np.empty(len(descriptions), dtype=object)
+        best = np.full(len(descriptions), -1, dtype=np.int64)
+        
+        if self.model is not None and descriptions:
             try:
-                # Transform descriptions using the same vectorizer
-                desc_vectors = self.vectorizer.transform(descriptions)
-                
-                # Calculate similarity between descriptions and category keywords
-                similarities = cosine_similarity(desc_vectors, self.category_vectors)
-                
-                # Assign categories based on highest similarity
-                for i, transaction in enumerate(transactions):
-                    transaction_copy = transaction.copy()
-                    
-                    # Check if transaction already has a category
-                    if 'category' not in transaction_copy:
-                        # Find the most similar category
-                        max_sim_idx = np.argmax(similarities[i])
-                        max_sim = similarities[i][max_sim_idx]
-                        
-                        # Only assign category if similarity is above threshold
-                        if max_sim > 0.1:
-                            transaction_copy['category'] = self.category_names[max_sim_idx]
-                        else:
-                            # Use rule-based categorization as fallback
-                            transaction_copy['category'] = self._rule_based_categorization(transaction_copy)
-                    
-                    categorized_transactions.append(transaction_copy)
+                best = self.model.top_categories(descriptions, SIMILARITY_THRESHOLD)
             except Exception:
                 # Fallback to rule-based categorization if vectorization fails
-                for transaction in transactions:
-                    transaction_copy = transaction.copy()
-                    if 'category' not in transaction_copy:
-                        transaction_copy['category'] = self._rule_based_categorization(transaction_copy)
-                    categorized_transactions.append(transaction_copy)
-        else:
-            # Use rule-based categorization if no category vectors
-            for transaction in transactions:
-                transaction_copy = transaction.copy()
-                if 'category' not in transaction_copy:
-                    transaction_copy['category'] = self._rule_based_categorization(transaction_copy)
-                categorized_transactions.append(transaction_copy)
+                pass
         
-        return categorized_transactions
+        matched = best >= 0
+        categories[matched] = np.asarray(self.category_names, dtype=object)[best[matched]]
+        
+        # Use rule-based categorization as fallback
+        for i in np.flatnonzero(~matched).tolist():
+            categories[i] = self._rule_based_category(descriptions[i], amounts[i])
+        
+        return categories
     
     def _rule_based_categorization(self, transaction: Dict[str, Any]) -> str:
         """Categorize a transaction using rule-based approach"""
-        description = transaction['description'].lower()
-        
-        # Handle income (positive amounts)
-        if transaction['amount'] > 0:
-            for keyword in self.categories.get('income', []):
-                if keyword.lower() in description:
-                    return 'income'
+        return self._rule_based_category(transaction['description'], transaction['amount'])
+    
+    def _rule_based_category(self, description: str, amount: float) -> str:
+        """
+        Categorize a description and amount by keyword rules
         
-        # Check each category for keyword matches
-        for category, keywords in self.categories.items():
-            for keyword in keywords:
-                if keyword.lower() in description:
-                    return category
+        Income keywords win for positive amounts; otherwise the first
+        category (in declared order) with a keyword in the description is
+        picked. All keyword hits are found in one pass of the matcher.
+        """
+        # Handle income (positive amounts) before the declared order
+        category = self.keyword_matcher.first_match(description, preferred='income' if amount > 0 else None)
         
         # Default to 'other' if no match found
-        return 'other'
+        return category or 'other'
     
     def _calculate_monthly_spending(self, transactions: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
         """Calculate monthly spending by category"""
@@ -262,60 +475,80 @@ class SpendingAnalyzer:
         }
     
     def _identify_recurring_expenses(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Identify recurring expenses based on similar descriptions and amounts"""
-        # Group transactions by similar descriptions
-        description_groups = defaultdict(list)
+        """
+        Identify recurring expenses based on similar descriptions and amounts
         
-        for transaction in transactions:
-            # Skip income (positive amounts)
-            if transaction['amount'] >= 0:
-                continue
-                
-            # Simplify description for grouping
-            simple_desc = self._simplify_description(transaction['description'])
-            description_groups[simple_desc].append(transaction)
+        Expenses are grouped by simplified description and computed as
+        columns: one stable sort by (group, date), then the amount mean and
+        standard deviation and the average interval between charges of all
+        groups at once. Each distinct description is simplified only once.
+        
+        Args:
+            transactions: Categorized transactions
+        
+        Returns:
+            List of recurring expenses, in order of each group's first transaction
+        """
+        amounts = np.fromiter((t['amount'] for t in transactions), dtype=float, count=len(transactions))
+        
+        # Skip income (positive amounts)
+        rows = np.flatnonzero(amounts < 0)
+        if len(rows) < 2:
+            return []
+        amounts = amounts[rows]
+        
+        # Group by simplified description; codes follow the order of first appearance
+        description_codes, descriptions = pd.factorize(
+            pd.Series([transactions[i]['description'] for i in rows.tolist()], dtype=object)
+        )
+        key_codes, keys = pd.factorize(
+            pd.Series([self._simplify_description(description) for description in descriptions], dtype=object)
+        )
+        groups = key_codes[description_codes]
+        num_groups = len(keys)
+        
+        dates = pd.to_datetime(
+            pd.Series([transactions[i]['date'] for i in rows.tolist()], dtype=object)
+        ).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        
+        # Sort by group, then date; ties keep their order in the statement
+        order = np.lexsort((dates, groups))
+        rows, groups, dates, amounts = rows[order], groups[order], dates[order], amounts[order]
+        
+        counts = np.bincount(groups, minlength=num_groups)
+        starts = np.cumsum(counts) - counts
+        
+        # Check for similar amounts (low standard deviation relative to mean)
+        amount_mean = np.bincount(groups, weights=amounts, minlength=num_groups) / counts
+        amount_std = np.sqrt(
+            np.bincount(groups, weights=(amounts - amount_mean[groups]) ** 2, minlength=num_groups) / counts
+        )
+        similar = (np.abs(amount_std / amount_mean) < 0.2) | (amount_std < 5)
+        
+        # Average whole days between consecutive transactions of a group
+        same_group = groups[1:] == groups[:-1]
+        intervals = np.diff(dates)[same_group] // NS_PER_DAY
+        interval_sums = np.bincount(groups[1:][same_group], weights=intervals, minlength=num_groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_interval = interval_sums / (counts - 1)
+        
+        # Check which cadence, if any, the interval suggests
+        frequency = np.full(num_groups, -1)
+        for index, (_, min_days, max_days) in enumerate(RECURRENCE_PERIODS):
+            frequency[(avg_interval >= min_days) & (avg_interval <= max_days)] = index
         
         recurring_expenses = []
         
-        for simple_desc, group in description_groups.items():
-            # Only consider groups with multiple transactions
-            if len(group) < 2:
-                continue
-                
-            # Sort by date
-            sorted_group = sorted(group, key=lambda t: t['date'])
-            
-            # Check for similar amounts
-            amounts = [t['amount'] for t in sorted_group]
-            amount_mean = np.mean(amounts)
-            amount_std = np.std(amounts)
-            
-            # If amounts are similar (low standard deviation relative to mean)
-            if abs(amount_std / amount_mean) < 0.2 or amount_std < 5:
-                # Calculate average time between transactions
-                dates = [t['date'] for t in sorted_group]
-                intervals = [(dates[i] - dates[i-1]).days for i in range(1, len(dates))]
-                
-                if intervals:
-                    avg_interval = sum(intervals) / len(intervals)
-                    
-                    # Check if the interval suggests monthly, weekly, or yearly recurrence
-                    frequency = None
-                    if 25 <= avg_interval <= 35:
-                        frequency = 'monthly'
-                    elif 6 <= avg_interval <= 8:
-                        frequency = 'weekly'
-                    elif 350 <= avg_interval <= 380:
-                        frequency = 'yearly'
-                    
-                    if frequency:
-                        recurring_expenses.append({
-                            'description': sorted_group[0]['description'],
-                            'category': sorted_group[0].get('category', 'other'),
-                            'average_amount': abs(amount_mean),  # Convert to positive for display
-                            'frequency': frequency,
-                            'transactions': sorted_group
-                        })
+        # Only consider groups with multiple transactions
+        for group in np.flatnonzero((counts >= 2) & similar & (frequency >= 0)).tolist():
+            sorted_group = [transactions[i] for i in rows[starts[group]:starts[group] + counts[group]].tolist()]
+            recurring_expenses.append({
+                'description': sorted_group[0]['description'],
+                'category': sorted_group[0].get('category', 'other'),
+                'average_amount': abs(float(amount_mean[group])),  # Convert to positive for display
+                'frequency': RECURRENCE_PERIODS[frequency[group]][0],
+                'transactions': sorted_group
+            })
         
         return recurring_expenses
     
@@ -418,14 +651,14 @@ class SpendingAnalyzer:
         desc = description.lower()
         
         # Remove common prefixes/suffixes and numbers
-        desc = re.sub(r'#\d+', '', desc)
-        desc = re.sub(r'\d{4}-\d{2}-\d{2}', '', desc)
-        desc = re.sub(r'\d+\.\d+', '', desc)
+        for pattern, marker in DESCRIPTION_NOISE:
+            if marker in desc:
+                desc = pattern.sub('', desc)
         
         # Remove common transaction words
-        common_words = ['payment', 'purchase', 'transaction', 'debit', 'credit']
-        for word in common_words:
-            desc = desc.replace(word, '')
+        for word in COMMON_TRANSACTION_WORDS:
+            if word in desc:
+                desc = desc.replace(word, '')
         
         # Remove extra whitespace
         desc = ' '.join(desc.split())
@@ -27,9 +27,16 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from flask_apscheduler import APScheduler
+import atexit
+import copy
+import threading
 import logging
+from collections import OrderedDict
 from parsers.parser_factory import ParserFactory
+from parsers.parse_cache import ParseCache
+from parsers.incremental import IncrementalIngestor
 from analysis.spending_analyzer import SpendingAnalyzer
+from analysis.category_cache import CategoryCache, set_shared_cache
 from recommendations.savings_recommender import SavingsRecommender
 from recommendations.investment_recommender import InvestmentRecommender
 
@@ -41,7 +48,7 @@ app = Flask(__name__,
 # Configure app
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-for-testing')
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
-app.config['ALLOWED_EXTENSIONS'] = {'csv', 'pdf', 'xlsx', 'xls'}
+app.config['ALLOWED_EXTENSIONS'] = {'csv', 'pdf', 'xlsx', 'xls', 'ofx', 'qfx', 'xml'}
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
 app.config['AI_CHAT_AVAILABLE'] = True  # Enable AI chat feature
 
@@ -72,16 +79,66 @@ def format_usd(value):
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize components
-parser_factory = ParserFactory()
+parser_factory = ParserFactory(include_raw_data=False)  # raw_data is never read by the web app
+parse_cache = ParseCache(os.path.join(tempfile.gettempdir(), 'fintech_parse_cache'))
+incremental_ingestor = IncrementalIngestor(os.path.join(tempfile.gettempdir(), 'fintech_incremental'),
+                                           parser_factory, parse_cache)
+category_cache = CategoryCache(path=os.path.join(tempfile.gettempdir(), 'fintech_category_cache.json'))
+set_shared_cache(category_cache)  # Merchant categories are reused across requests and restarts
+atexit.register(category_cache.save)
 analyzer = SpendingAnalyzer()
 savings_recommender = SavingsRecommender()
 investment_recommender = InvestmentRecommender()
 
+# Number of uploaded statements whose transactions and analysis are kept in memory, so
+# re-uploading a statement that only grew parses and categorizes just the new rows
+MAX_TRACKED_STATEMENTS = 16
+tracked_statements = OrderedDict()
+tracked_statements_lock = threading.Lock()  # Request threads share the tracked statements
+
 def allowed_file(filename):
     """Check if the file has an allowed extension"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def parse_statement(file_path):
+    """Parse a statement file; if it only grew since it was last parsed, just the new rows are parsed"""
+    source_id = os.path.abspath(file_path)
+    with tracked_statements_lock:
+        tracked = tracked_statements.pop(source_id, None)
+        if tracked is None:
+            # The earlier rows are not in memory (e.g. after a restart), so parse the whole file
+            incremental_ingestor.forget(source_id)
+        
+        result = incremental_ingestor.ingest(file_path, source_id)
+        if result.appended:
+            tracked['transactions'] = tracked['transactions'] + result.transactions
+        else:
+            tracked = {'transactions': result.transactions, 'analysis': None, 'analyzed': 0}
+        
+        tracked_statements[source_id] = tracked
+        while len(tracked_statements) > MAX_TRACKED_STATEMENTS:
+            tracked_statements.popitem(last=False)
+        return tracked['transactions']
+
+def analyze_statement(file_path, transactions):
+    """Analyze a parsed statement, categorizing only the transactions appended since its last analysis"""
+    with tracked_statements_lock:
+        tracked = tracked_statements.get(os.path.abspath(file_path))
+        if tracked is None or tracked['transactions'] is not transactions:
+            return analyzer.analyze(transactions)
+        
+        if tracked['analysis'] is None:
+            tracked['analysis'] = analyzer.analyze(transactions)
+        elif tracked['analyzed'] < len(transactions):
+            tracked['analysis'] = analyzer.append(tracked['analysis'], transactions[tracked['analyzed']:])
+        tracked['analyzed'] = len(transactions)
+        analysis = tracked['analysis']
+    
+    # The routes convert the summaries in place, so they get a copy of the kept analysis
+    summaries = copy.deepcopy({key: value for key, value in analysis.items() if key != 'transactions'})
+    return dict(summaries, transactions=analysis['transactions'])
+
 @app.route('/')
 def index():
     """Render the home page"""
@@ -114,9 +171,8 @@ def upload_file():
         
         # Process the file
         try:
-            # Parse the statement
-            statement_parser = parser_factory.get_parser(file_path)
-            transactions = statement_parser.parse(file_path)
+            # Parse the statement (a re-upload that only grew parses just the new rows)
+            transactions = parse_statement(file_path)
             
             # Store transactions in session
             session['file_path'] = file_path
@@ -156,8 +212,7 @@ def analyze():
         print(f"Parsing file: {session['file_path']}")
         try:
             file_path = session['file_path']
-            statement_parser = parser_factory.get_parser(file_path)
-            transactions = statement_parser.parse(file_path)
+            transactions = parse_statement(file_path)
         except Exception as e:
             print(f"Error parsing file: {str(e)}")
             flash(f'Error parsing file: {str(e)}')
@@ -172,7 +227,7 @@ def analyze():
     try:
         # Analyze spending
         print(f"Analyzing {len(transactions)} transactions")
-        spending_analysis = analyzer.analyze(transactions)
+        spending_analysis = analyze_statement(file_path, transactions)
         
         # Generate recommendations
         savings_recommendations = savings_recommender.recommend(spending_analysis)
@@ -372,8 +427,7 @@ def recommendations():
             file_path = session['file_path']
             
             # Parse the statement
-            statement_parser = parser_factory.get_parser(file_path)
-            transactions = statement_parser.parse(file_path)
+            transactions = parse_statement(file_path)
             
             # Store transactions in session
             session['transactions'] = transactions
@@ -384,7 +438,7 @@ def recommendations():
             
             # Process the transactions to generate recommendations
             # Analyze spending
-            spending_analysis = analyzer.analyze(transactions)
+            spending_analysis = analyze_statement(file_path, transactions)
             
             # Generate recommendations
             savings_recommendations = savings_recommender.recommend(spending_analysis)
@@ -592,8 +646,7 @@ def ai_recommendations():
             file_path = session['file_path']
             
             # Parse the statement
-            statement_parser = parser_factory.get_parser(file_path)
-            transactions = statement_parser.parse(file_path)
+            transactions = parse_statement(file_path)
             
             # Store transactions in session
             session['transactions'] = transactions
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmarks - Time statement parsers on synthetic CSV, XLSX and PDF files
+
+Usage:
+    python -m benchmarks.bench_parsers --output bench.json
+    python -m benchmarks.bench_parsers --sizes 1000,10000 --formats csv,xlsx
+    python -m benchmarks.bench_parsers --output new.json --compare bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import datetime
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Allow running as a script from the repository root or the benchmarks directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.sample_data import generate_sample_transactions
+
+
+# Statement sizes (rows) and formats benchmarked by default
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_FORMATS = ['csv', 'xlsx', 'pdf']
+
+# Rendering a PDF page with matplotlib is slow, so PDFs are capped unless asked for
+DEFAULT_PDF_MAX_ROWS = 10000
+
+# Transaction lines per PDF page
+PDF_LINES_PER_PAGE = 50
+
+# Rows requested from the sample generator per call (it slows down quadratically with size)
+GENERATOR_CHUNK_ROWS = 5000
+
+# Default location of the generated statements, reused across runs
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / '.data'
+
+# Relative slowdown (or memory growth) reported as a regression by --compare
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def generate_rows(num_rows: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Synthesize transactions with data.sample_data.generate_sample_transactions
+    
+    The generator is called in chunks, each shifted back by a year, until
+    enough rows exist.
+    
+    Args:
+        num_rows: Number of transactions
+        seed: Random seed, so every run benchmarks the same statements
+    
+    Returns:
+        List of transaction dictionaries sorted by date
+    """
+    random.seed(seed)
+    rows: List[Dict[str, Any]] = []
+    shift = 0
+    
+    while len(rows) < num_rows:
+        chunk = generate_sample_transactions(num_transactions=min(GENERATOR_CHUNK_ROWS, num_rows - len(rows) + 50))
+        offset = datetime.timedelta(days=365 * shift)
+        rows.extend(dict(t, date=t['date'] - offset) for t in chunk)
+        shift += 1
+    
+    rows = rows[:num_rows]
+    rows.sort(key=lambda t: t['date'])
+    return rows
+
+
+def write_csv(rows: List[Dict[str, Any]], path: Path) -> None:
+    """Write a bank-style CSV statement (Date, Description, Amount)"""
+    import csv
+    
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Description', 'Amount'])
+        for t in rows:
+            writer.writerow([t['date'].strftime('%m/%d/%Y'), t['description'], f"{t['amount']:.2f}"])
+
+
+def write_xlsx(rows: List[Dict[str, Any]], path: Path) -> None:
+    """Write an XLSX statement with a Transactions sheet"""
+    import openpyxl
+    
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Transactions')
+    sheet.append(['Date', 'Description', 'Amount'])
+    for t in rows:
+        sheet.append([t['date'], t['description'], t['amount']])
+    workbook.save(path)
+
+
+def write_pdf(rows: List[Dict[str, Any]], path: Path) -> None:
+    """Write a text PDF statement, one transaction line per row"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    
+    with PdfPages(path) as pdf:
+        for start in range(0, len(rows), PDF_LINES_PER_PAGE):
+            fig = plt.figure(figsize=(8.5, 11))
+            fig.text(0.08, 0.96, f'Account Statement - page {start // PDF_LINES_PER_PAGE + 1}', fontsize=10)
+            for i, t in enumerate(rows[start:start + PDF_LINES_PER_PAGE]):
+                fig.text(
+                    0.08, 0.93 - i * 0.018,
+                    f"{t['date'].strftime('%m/%d/%Y')}  {t['description']}  {t['amount']:.2f}",
+                    fontsize=7
+                )
+            pdf.savefig(fig)
+            plt.close(fig)
+
+
+WRITERS = {'csv': write_csv, 'xlsx': write_xlsx, 'pdf': write_pdf}
+
+
+def statement_path(data_dir: Path, fmt: str, num_rows: int, seed: int) -> Path:
+    """Generate a statement file unless it already exists, and return its path"""
+    path = data_dir / f'statement_{num_rows}_{seed}.{fmt}'
+    if not path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Generating {path.name}...", file=sys.stderr)
+        tmp_path = path.with_name(f'.tmp_{path.name}')
+        WRITERS[fmt](generate_rows(num_rows, seed), tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def run_child(path: str) -> Dict[str, Any]:
+    """
+    Parse one file in this process and report time and peak memory
+    
+    Runs in a fresh interpreter so the peak RSS belongs to this parse only.
+    """
+    from parsers.parser_factory import ParserFactory
+    
+    start = time.perf_counter()
+    parser = ParserFactory().get_parser(path)
+    transactions = parser.parse(path)
+    seconds = time.perf_counter() - start
+    
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+    
+    return {
+        'parser': type(parser).__name__,
+        'transactions': len(transactions),
+        'seconds': seconds,
+        'peak_rss_mb': round(peak_rss_mb, 1)
+    }
+
+
+def measure(path: Path, repeat: int) -> Dict[str, Any]:
+    """Parse a file in `repeat` child processes and keep the fastest run"""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', str(path)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def run_benchmarks(
+    sizes: List[int],
+    formats: List[str],
+    data_dir: Path,
+    repeat: int = 1,
+    seed: int = 42,
+    pdf_max_rows: int = DEFAULT_PDF_MAX_ROWS
+) -> Dict[str, Any]:
+    """
+    Run every (format, size) combination
+    
+    Returns:
+        Dictionary with run metadata and one result per combination
+    """
+    results = []
+    for fmt in formats:
+        for num_rows in sizes:
+            if fmt == 'pdf' and num_rows > pdf_max_rows:
+                print(f"Skipping pdf at {num_rows} rows (above --pdf-max-rows)", file=sys.stderr)
+                continue
+            
+            path = statement_path(data_dir, fmt, num_rows, seed)
+            result = measure(path, repeat)
+            result.update({
+                'format': fmt,
+                'rows': num_rows,
+                'file_mb': round(path.stat().st_size / (1024 * 1024), 2),
+                'seconds': round(result['seconds'], 4),
+                'rows_per_sec': round(num_rows / result['seconds']) if result['seconds'] > 0 else None
+            })
+            results.append(result)
+            print(
+                f"{fmt:>5} {num_rows:>8} rows  {result['seconds']:>9.3f}s  "
+                f"{result['rows_per_sec'] or 0:>10} rows/s  {result['peak_rss_mb']:>8.1f} MB",
+                file=sys.stderr
+            )
+    
+    return {'meta': _metadata(seed, repeat), 'results': results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two result sets
+    
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run (e.g. another commit)
+        threshold: Relative slowdown or memory growth counted as a regression
+    
+    Returns:
+        List of regression descriptions (empty if there are none)
+    """
+    previous = {(r['format'], r['rows']): r for r in baseline.get('results', [])}
+    regressions = []
+    
+    print(f"\n{'format':>6} {'rows':>8} {'time':>8} {'rss':>8}  (current vs baseline)")
+    for result in current['results']:
+        key = (result['format'], result['rows'])
+        if key not in previous:
+            continue
+        
+        old = previous[key]
+        time_ratio = result['seconds'] / old['seconds'] if old['seconds'] else 1.0
+        rss_ratio = result['peak_rss_mb'] / old['peak_rss_mb'] if old['peak_rss_mb'] else 1.0
+        print(f"{key[0]:>6} {key[1]:>8} {time_ratio:>7.2f}x {rss_ratio:>7.2f}x")
+        
+        if time_ratio > 1 + threshold:
+            regressions.append(f"{key[0]} {key[1]} rows: {time_ratio:.2f}x slower")
+        if rss_ratio > 1 + threshold:
+            regressions.append(f"{key[0]} {key[1]} rows: {rss_ratio:.2f}x peak memory")
+        if result['transactions'] != old['transactions']:
+            regressions.append(
+                f"{key[0]} {key[1]} rows: {result['transactions']} transactions (was {old['transactions']})"
+            )
+    
+    return regressions
+
+
+def _metadata(seed: int, repeat: int) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark statement parsers on synthetic statements")
+    parser.add_argument('--sizes', type=str, default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated statement sizes in rows")
+    parser.add_argument('--formats', type=str, default=','.join(DEFAULT_FORMATS),
+                        help="Comma-separated formats (csv, xlsx, pdf)")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per file; the fastest is kept")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the generated statements")
+    parser.add_argument('--pdf-max-rows', type=int, default=DEFAULT_PDF_MAX_ROWS,
+                        help="Largest PDF benchmarked (PDF generation is slow)")
+    parser.add_argument('--data-dir', type=str, default=str(DEFAULT_DATA_DIR),
+                        help="Directory for the generated statements")
+    parser.add_argument('--output', type=str, help="Write JSON results to this file")
+    parser.add_argument('--compare', type=str, help="Baseline JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown counted as a regression (default 0.10)")
+    parser.add_argument('--child', type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.child:
+        print(json.dumps(run_child(args.child)))
+        return 0
+    
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown:
+        parser.error(f"Unknown formats: {', '.join(unknown)}")
+    
+    results = run_benchmarks(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        formats=formats,
+        data_dir=Path(args.data_dir),
+        repeat=args.repeat,
+        seed=args.seed,
+        pdf_max_rows=args.pdf_max_rows
+    )
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions.")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
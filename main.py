@@ -11,6 +11,7 @@ from pathlib import Path
 
 # Import core modules
 from parsers.parser_factory import ParserFactory
+from parsers.batch_ingest import BatchIngestor, is_glob
 from analysis.spending_analyzer import SpendingAnalyzer
 from recommendations.savings_recommender import SavingsRecommender
 from recommendations.investment_recommender import InvestmentRecommender
@@ -27,7 +28,7 @@ def main():
     parser.add_argument(
         "--statement", 
         type=str, 
-        help="Path to your bank statement file (CSV, PDF, XLSX)"
+        help="Path to your bank statement file (CSV, PDF, XLSX, OFX/QFX, CAMT.053 XML), or a directory or glob of statements"
     )
     parser.add_argument(
         "--interactive", 
@@ -60,18 +61,21 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    # Check if file exists
+    # Check if file exists (a glob pattern is checked when it is expanded)
     statement_path = Path(args.statement)
-    if not statement_path.exists():
+    if not is_glob(args.statement) and not statement_path.exists():
         print(f"Error: File not found: {args.statement}")
         sys.exit(1)
     
     # Process the statement
     try:
-        # 1. Parse the statement
-        parser_factory = ParserFactory()
-        statement_parser = parser_factory.get_parser(statement_path)
-        transactions = statement_parser.parse(statement_path)
+        # 1. Parse the statement(s)
+        if statement_path.is_dir() or is_glob(args.statement):
+            transactions = ingest_statements(args.statement)
+        else:
+            parser_factory = ParserFactory()
+            statement_parser = parser_factory.get_parser(statement_path)
+            transactions = statement_parser.parse(statement_path)
         
         print(f"Successfully parsed {len(transactions)} transactions.")
         
@@ -104,5 +108,19 @@ def main():
         print(f"Error processing statement: {e}")
         sys.exit(1)
 
+def ingest_statements(source):
+    """Parse a directory or glob of statements and print a per-file report."""
+    result = BatchIngestor().ingest(source)
+    
+    for report in result.reports:
+        if report.error:
+            print(f"  {report.path}: FAILED after {report.seconds:.2f}s - {report.error}")
+        else:
+            print(f"  {report.path}: {report.transactions} transactions in {report.seconds:.2f}s")
+    
+    print(f"Parsed {len(result.reports) - len(result.failed)} of {len(result.reports)} files "
+          f"in {result.seconds:.2f}s, removed {result.duplicates_removed} duplicate transactions.")
+    return result.transactions
+
 if __name__ == "__main__":
     main()
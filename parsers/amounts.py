@@ -0,0 +1,94 @@
+"""
+Amounts - Vectorized normalization of statement amount columns
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Currency symbols and codes stripped from amounts
+_CURRENCY = r'[$€£¥₹]|\b(?:USD|EUR|GBP|CAD|AUD)\b'
+
+# CR (credit) and DR (debit) suffixes, as a separate word or attached to the number (12.50CR)
+_CREDIT_SUFFIX = r'(?:(?<=[\d.)])|\b)CR\.?$'
+_DEBIT_SUFFIX = r'(?:(?<=[\d.)])|\b)DR\.?$'
+_SIGN_SUFFIX = r'\s*(?:(?<=[\d.)])|\b)(?:CR|DR)\.?$'
+
+# Amount text after cleanup: optional sign, digits with optional decimals
+_NUMBER = r'^[+-]?(?:\d+\.?\d*|\.\d+)$'
+
+
+def normalize_amounts(series: pd.Series, decimal: str = '.') -> Tuple[pd.Series, int]:
+    """
+    Convert an amount column to signed floats with whole-column operations
+    
+    Handles currency symbols and codes, thousands separators, parentheses,
+    trailing minus signs and CR/DR suffixes (CR is a credit, DR a debit).
+    
+    Args:
+        series: Raw amount column (numbers or text)
+        decimal: Decimal mark of text amounts ('.' or ',' as in 1.234,56)
+    
+    Returns:
+        Tuple of (amounts as float64 with rejected values set to 0.0,
+        number of non-empty values that could not be parsed)
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        amounts = series.astype(float)
+        return amounts.fillna(0.0), 0
+    
+    present = series.notna()
+    text = series.astype(str).str.strip().str.upper()
+    present &= text.ne('') & text.ne('NAN')
+    
+    # CR/DR suffixes decide the sign; remember them before stripping
+    credit = text.str.contains(_CREDIT_SUFFIX, regex=True)
+    debit = text.str.contains(_DEBIT_SUFFIX, regex=True)
+    text = text.str.replace(_SIGN_SUFFIX, '', regex=True)
+    
+    # Drop currency symbols and spaces, so "$ (3.00)" and "( 3.00 )" read as (3.00)
+    text = text.str.replace(_CURRENCY, '', regex=True).str.replace(r'\s', '', regex=True)
+    
+    # Parentheses and trailing minus mark negative values: (12.50) and 12.50-
+    negative = text.str.match(r'^\(.*\)$') | text.str.endswith('-')
+    text = text.str.replace(r'^\((.*)\)$', r'\1', regex=True).str.rstrip('-')
+    
+    # With a decimal comma, dots separate thousands
+    if decimal == ',':
+        text = text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    
+    # Drop thousands separators
+    text = text.str.replace(',', '', regex=False)
+    
+    valid = text.str.match(_NUMBER)
+    amounts = pd.to_numeric(text.where(valid), errors='coerce')
+    
+    amounts = amounts.where(~negative, -amounts.abs())
+    amounts = amounts.where(~debit, -amounts.abs())
+    amounts = amounts.where(~credit, amounts.abs())
+    
+    rejected = int((present & amounts.isna()).sum())
+    return amounts.fillna(0.0).astype(float), rejected
+
+
+def combine_debit_credit(debit: pd.Series, credit: pd.Series, decimal: str = '.') -> Tuple[pd.Series, int]:
+    """
+    Combine separate debit and credit columns into one signed amount column
+    
+    Debits become negative and credits positive, whatever sign the bank used.
+    
+    Args:
+        debit: Money-out column (blank when the row is a credit)
+        credit: Money-in column (blank when the row is a debit)
+        decimal: Decimal mark of text amounts
+    
+    Returns:
+        Tuple of (signed amounts as float64, number of rejected values)
+    """
+    debit_amounts, debit_rejected = normalize_amounts(debit, decimal)
+    credit_amounts, credit_rejected = normalize_amounts(credit, decimal)
+    
+    amounts = credit_amounts.abs() - debit_amounts.abs()
+    return pd.Series(np.asarray(amounts, dtype=float), index=debit.index), debit_rejected + credit_rejected
@@ -4,12 +4,74 @@ Base Parser - Abstract base class for all statement parsers
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Iterator, Sequence, Tuple
+
+import pandas as pd
+
+from parsers.amounts import normalize_amounts, combine_debit_credit
+from parsers.schema_inference import ColumnSchema
+from parsers.transaction_batch import TransactionBatch
+
+
+# Default number of rows per batch yielded by iter_parse
+DEFAULT_CHUNK_ROWS = 50000
 
 
 class BaseParser(ABC):
     """Abstract base class for all statement parsers"""
     
+    # Bump when a parser's output changes so cached parse results are invalidated
+    PARSER_VERSION = '6'
+    
+    # Number of amount values that could not be parsed (and became 0.0) in the last parse
+    rejected_amounts = 0
+    
+    # File extensions handled by the parser, used when content sniffing is inconclusive
+    EXTENSIONS: Tuple[str, ...] = ()
+    
+    # Byte signatures that files of this format start with
+    MAGIC: Tuple[bytes, ...] = ()
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """
+        Cheap probe deciding from the first bytes of a file whether this parser handles it
+        
+        The default checks MAGIC; parsers for text formats override it.
+        
+        Args:
+            head_bytes: First few KB of the file
+        
+        Returns:
+            True if the content looks like this parser's format
+        """
+        return any(head_bytes.startswith(magic) for magic in cls.MAGIC)
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'BaseParser':
+        """
+        Instantiate the parser from factory options, ignoring options it does not use
+        
+        Args:
+            **options: Factory options (e.g. lazy_raw_data)
+        
+        Returns:
+            Parser instance
+        """
+        return cls()
+    
+    def options(self) -> Dict[str, Any]:
+        """
+        Settings of this parser instance that change its output
+        
+        Parse results are only shared (e.g. by the parse cache) between
+        parsers with the same options. Values must be JSON-serializable.
+        
+        Returns:
+            Dictionary of option names and values
+        """
+        return {}
+    
     @abstractmethod
     def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """
@@ -31,6 +93,32 @@ class BaseParser(ABC):
         """
         pass
     
+    def iter_parse(
+        self,
+        file_path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[TransactionBatch]:
+        """
+        Parse a bank statement file as a stream of transaction batches
+        
+        The default implementation parses the whole file and slices the result.
+        Parsers that can read their format incrementally override this to keep
+        memory bounded by the chunk size.
+        
+        Args:
+            file_path: Path to the bank statement file
+            chunk_rows: Maximum number of transactions per batch
+        
+        Yields:
+            TransactionBatch objects in file order
+        
+        Raises:
+            ValueError: If file cannot be parsed
+        """
+        transactions = self.parse(file_path)
+        for start in range(0, len(transactions), chunk_rows):
+            yield TransactionBatch.from_dicts(transactions[start:start + chunk_rows])
+    
     def _standardize_transaction(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
         """
         Standardize a transaction dictionary to ensure consistent keys
@@ -44,3 +132,31 @@ class BaseParser(ABC):
         # Implement common standardization logic here
         # This can be overridden by subclasses if needed
         return transaction
+    
+    def _is_header_row(self, values: Sequence[Any]) -> bool:
+        """Check if a row of cell values is likely a (repeated) header row"""
+        # Convert all values to string and lowercase
+        values = [str(v).lower() for v in values]
+        
+        # Check for common header terms
+        header_terms = ['date', 'description', 'amount', 'balance', 'transaction']
+        matches = sum(1 for term in header_terms if any(term in v for v in values))
+        
+        # If multiple header terms are found, it's likely a header row
+        return matches >= 2
+    
+    def _amount_column(self, df: pd.DataFrame, schema: ColumnSchema, decimal: str = '.') -> Tuple[pd.Series, int]:
+        """
+        Normalize the amount of every row of a table in one pass
+        
+        Args:
+            df: Statement table
+            schema: Inferred columns of the table
+            decimal: Decimal mark of text amounts
+        
+        Returns:
+            Tuple of (signed float amounts aligned with df, number of rejected values)
+        """
+        if schema.amount is not None:
+            return normalize_amounts(df[schema.amount], decimal)
+        return combine_debit_credit(df[schema.debit], df[schema.credit], decimal)
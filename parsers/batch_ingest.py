@@ -0,0 +1,187 @@
+"""
+Batch Ingest - Parse many statements at once and merge them into one transaction set
+"""
+
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, Tuple, NamedTuple
+
+import pandas as pd
+
+from parsers.parser_factory import ParserFactory, supported_extensions
+from analysis.dedup import DedupIndex
+
+
+# Upper bound on parser processes; statements are small, so more rarely helps
+MAX_WORKERS = 8
+
+# Characters that make a source a glob pattern rather than a path
+GLOB_CHARS = '*?['
+
+
+class FileReport(NamedTuple):
+    """Outcome of parsing one statement file"""
+    path: str
+    transactions: int
+    seconds: float
+    error: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    """Merged transactions of a batch plus per-file reports"""
+    transactions: List[Dict[str, Any]]
+    reports: List[FileReport]
+    duplicates_removed: int
+    seconds: float
+    
+    @property
+    def failed(self) -> List[FileReport]:
+        """Reports of the files that could not be parsed"""
+        return [report for report in self.reports if report.error]
+
+
+class BatchIngestor:
+    """Parses a directory or glob of statements in a bounded process pool"""
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        include_raw_data: bool = True,
+        date_window_days: int = 0
+    ):
+        """
+        Initialize the batch ingestor
+        
+        Args:
+            max_workers: Number of parser processes (defaults to the CPU count, capped at MAX_WORKERS)
+            include_raw_data: Keep each transaction's raw_data; dropping it avoids
+                              shipping the original rows back from the workers
+            date_window_days: Maximum number of days between two copies of a
+                              transaction in overlapping statements
+        """
+        self.max_workers = max_workers or min(os.cpu_count() or 1, MAX_WORKERS)
+        self.include_raw_data = include_raw_data
+        self.date_window_days = date_window_days
+    
+    def ingest(self, source: Union[str, Path, List[Union[str, Path]]]) -> BatchResult:
+        """
+        Parse all statements of a source and merge them
+        
+        Args:
+            source: Directory, glob pattern, single file, or list of files
+        
+        Returns:
+            BatchResult with the deduplicated, date-sorted transactions
+        
+        Raises:
+            ValueError: If the source matches no statement files
+        """
+        start = time.perf_counter()
+        
+        paths = resolve_statement_paths(source)
+        if not paths:
+            raise ValueError(f"No statement files found for: {source}")
+        
+        results = self._parse_all(paths)
+        
+        reports = [FileReport(str(path), len(transactions), seconds, error)
+                   for path, transactions, seconds, error in results]
+        transactions, duplicates = merge_statements(
+            [transactions for _, transactions, _, _ in results], self.date_window_days
+        )
+        
+        return BatchResult(transactions, reports, duplicates, time.perf_counter() - start)
+    
+    def _parse_all(self, paths: List[Path]) -> List[Tuple[Path, List[Dict[str, Any]], float, Optional[str]]]:
+        """Parse every file, in a process pool when there is more than one"""
+        workers = min(self.max_workers, len(paths))
+        args = [self.include_raw_data] * len(paths)
+        
+        if workers <= 1:
+            return list(map(_parse_file, paths, args))
+        
+        # map keeps the results in input order, so merging is deterministic
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_file, paths, args))
+
+
+def resolve_statement_paths(source: Union[str, Path, List[Union[str, Path]]]) -> List[Path]:
+    """
+    Expand a batch source into a sorted list of statement files
+    
+    Args:
+        source: Directory, glob pattern, single file, or list of any of these
+    
+    Returns:
+        Sorted list of unique file paths
+    """
+    if isinstance(source, (list, tuple)):
+        paths = [path for item in source for path in resolve_statement_paths(item)]
+        return list(dict.fromkeys(paths))
+    
+    source = str(source)
+    
+    if os.path.isdir(source):
+        extensions = supported_extensions()
+        return sorted(
+            path for path in Path(source).iterdir()
+            if path.is_file() and path.suffix.lower() in extensions
+        )
+    
+    if is_glob(source):
+        return sorted(Path(path) for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+    
+    return [Path(source)] if os.path.isfile(source) else []
+
+
+def is_glob(source: Union[str, Path]) -> bool:
+    """Whether a source string is a glob pattern"""
+    return any(char in str(source) for char in GLOB_CHARS)
+
+
+def merge_statements(
+    statements: List[List[Dict[str, Any]]],
+    date_window_days: int = 0
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Merge the transactions of several statements, dropping overlapping copies
+    
+    Transactions are matched on (date, description, amount) through a
+    DedupIndex. Identical transactions within one statement are kept; across
+    statements each transaction is counted once, so the overlap between e.g.
+    a monthly and a quarterly export is not doubled.
+    
+    Args:
+        statements: Transactions of each statement, in ingestion order
+        date_window_days: Maximum number of days between two copies of a transaction
+    
+    Returns:
+        Tuple of (merged transactions sorted by date, number of duplicates removed)
+    """
+    index = DedupIndex(date_window_days)
+    merged = []
+    for source, transactions in enumerate(statements):
+        merged.extend(index.filter(transactions, source))
+    
+    # Stable sort: same-day transactions keep their statement order
+    merged.sort(key=lambda t: pd.Timestamp(t['date']) if t.get('date') is not None else pd.Timestamp.max)
+    
+    return merged, index.duplicates
+
+
+def _parse_file(path: Path, include_raw_data: bool) -> Tuple[Path, List[Dict[str, Any]], float, Optional[str]]:
+    """Worker: parse one file and time it, reporting failures instead of raising"""
+    start = time.perf_counter()
+    try:
+        transactions = ParserFactory(include_raw_data=include_raw_data).get_parser(path).parse(path)
+        
+        # Parsers of formats without column projection still attach raw_data
+        if not include_raw_data:
+            for transaction in transactions:
+                transaction.pop('raw_data', None)
+        return path, transactions, time.perf_counter() - start, None
+    except Exception as e:
+        return path, [], time.perf_counter() - start, str(e)
@@ -0,0 +1,205 @@
+"""
+CAMT Parser - Streams ISO 20022 CAMT.053 bank-to-customer statements
+"""
+
+import datetime
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, Iterator
+
+import pandas as pd
+
+from parsers.base_parser import BaseParser, DEFAULT_CHUNK_ROWS
+from parsers.transaction_batch import TransactionBatch
+from utils.date_utils import parse_date
+
+
+# Entry fields kept as raw_data, by local element path below <Ntry>
+RAW_FIELDS = ['NtryRef', 'AcctSvcrRef', 'Amt', 'Ccy', 'CdtDbtInd', 'Sts', 'BookgDt', 'ValDt', 'AddtlNtryInf']
+
+
+class CAMTParser(BaseParser):
+    """Parser for CAMT.053 XML statements"""
+    
+    EXTENSIONS = ('.xml',)
+    
+    def __init__(self, include_raw_data: bool = True):
+        """
+        Initialize the CAMT parser
+        
+        Args:
+            include_raw_data: Attach the fields of each entry to its transaction as raw_data
+        """
+        self.include_raw_data = include_raw_data
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'CAMTParser':
+        return cls(include_raw_data=options.get('include_raw_data', True))
+    
+    def options(self) -> Dict[str, Any]:
+        return {'include_raw_data': self.include_raw_data}
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """XML whose root declares the camt.053 namespace"""
+        return b'camt.053' in head_bytes and b'<' in head_bytes
+    
+    def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """
+        Parse a CAMT.053 statement file
+        
+        Args:
+            file_path: Path to the CAMT.053 XML file
+        
+        Returns:
+            List of standardized transaction dictionaries
+        """
+        transactions = []
+        for batch in self.iter_parse(file_path):
+            transactions.extend(batch.to_dicts())
+        return transactions
+    
+    def iter_parse(
+        self,
+        file_path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[TransactionBatch]:
+        """
+        Stream a CAMT.053 statement as transaction batches
+        
+        The XML is read with iterparse; each <Ntry> element is converted as soon
+        as it is complete and then detached from the tree, so memory stays
+        constant however many entries the statement has.
+        
+        Args:
+            file_path: Path to the CAMT.053 XML file
+            chunk_rows: Maximum number of transactions per batch
+        
+        Yields:
+            TransactionBatch objects in file order
+        """
+        try:
+            self.rejected_amounts = 0
+            rows = []
+            for fields in self._iter_entries(file_path):
+                rows.append(fields)
+                if len(rows) >= chunk_rows:
+                    yield self._build_batch(rows)
+                    rows = []
+            
+            if rows:
+                yield self._build_batch(rows)
+        
+        except Exception as e:
+            raise ValueError(f"Failed to parse CAMT file: {e}")
+    
+    def _iter_entries(self, file_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Yield the fields of each <Ntry> element in file order"""
+        # Statement whose entries are being read; finished entries are detached from it
+        statement = None
+        
+        for event, elem in ET.iterparse(str(file_path), events=('start', 'end')):
+            tag = elem.tag
+            
+            if event == 'start':
+                if tag == 'Stmt' or tag.endswith('}Stmt'):
+                    statement = elem
+                continue
+            
+            if tag == 'Ntry' or tag.endswith('}Ntry'):
+                yield _entry_fields(elem)
+                
+                elem.clear()
+                if statement is not None:
+                    statement.remove(elem)
+    
+    def _build_batch(self, rows: List[Dict[str, Any]]) -> TransactionBatch:
+        """Convert entry field dictionaries into a transaction batch"""
+        raw_data = None
+        if self.include_raw_data:
+            # Tags missing from a transaction are None rather than NaN
+            raw_data = pd.DataFrame(rows, columns=RAW_FIELDS)
+            raw_data = raw_data.astype(object).where(raw_data.notna(), None)
+        
+        dates = [parse_camt_date(row.get('BookgDt') or row.get('ValDt')) for row in rows]
+        descriptions = [row.get('description') or row.get('AddtlNtryInf') or '' for row in rows]
+        
+        amounts = []
+        rejected = 0
+        for row in rows:
+            try:
+                amount = abs(float(row.get('Amt', '')))
+            except ValueError:
+                amounts.append(0.0)
+                rejected += 1
+                continue
+            
+            # CAMT amounts are unsigned; the credit/debit indicator gives the sign
+            amounts.append(-amount if row.get('CdtDbtInd') == 'DBIT' else amount)
+        
+        batch = TransactionBatch(dates, descriptions, amounts, raw_data=raw_data, rejected_amounts=rejected)
+        batch.frame['transaction_type'] = [
+            {'CRDT': 'credit', 'DBIT': 'debit'}.get(row.get('CdtDbtInd')) for row in rows
+        ]
+        
+        self.rejected_amounts += rejected
+        return batch
+
+
+def parse_camt_date(value: Optional[str]) -> Optional[datetime.date]:
+    """Parse an ISO date or date-time (2024-01-15 or 2024-01-15T10:30:00+01:00)"""
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        return parse_date(value)
+
+
+def _entry_fields(entry: ET.Element) -> Dict[str, Any]:
+    """Extract the fields of one <Ntry> element"""
+    fields: Dict[str, Any] = {}
+    remittance = []
+    parties: Dict[str, str] = {}
+    
+    for child in entry.iter():
+        name = _local_name(child.tag)
+        
+        if name == 'Amt':
+            # The entry amount comes first; transaction-level amounts repeat it
+            if 'Amt' not in fields:
+                fields['Amt'] = (child.text or '').strip()
+                fields['Ccy'] = child.get('Ccy')
+        elif name in ('BookgDt', 'ValDt'):
+            # <BookgDt><Dt>...</Dt></BookgDt> or <DtTm>
+            if name not in fields:
+                fields[name] = next(((date.text or '').strip() for date in child), '')
+        elif name in ('NtryRef', 'AcctSvcrRef', 'CdtDbtInd', 'AddtlNtryInf'):
+            if name not in fields:
+                fields[name] = (child.text or '').strip()
+        elif name == 'Sts':
+            # camt.053.001.08+ wraps the status code in <Cd>
+            if 'Sts' not in fields:
+                fields['Sts'] = (child.text or '').strip() or ''.join((code.text or '').strip() for code in child)
+        elif name == 'Ustrd':
+            if child.text and child.text.strip():
+                remittance.append(child.text.strip())
+        elif name in ('Cdtr', 'Dbtr') and name not in parties:
+            # <Cdtr><Nm> in older versions, <Cdtr><Pty><Nm> from camt.053.001.08
+            party_name = next(
+                (elem.text.strip() for elem in child.iter() if _local_name(elem.tag) == 'Nm' and elem.text),
+                None
+            )
+            if party_name:
+                parties[name] = party_name
+    
+    # The counterparty is the creditor of a debit and the debtor of a credit
+    counterparty = parties.get('Cdtr') if fields.get('CdtDbtInd') == 'DBIT' else parties.get('Dbtr')
+    parts = [part for part in [counterparty, ' '.join(remittance)] if part]
+    fields['description'] = ' - '.join(parts)
+    return fields
+
+
+def _local_name(tag: str) -> str:
+    """Element name without its namespace"""
+    return tag.rsplit('}', 1)[-1]
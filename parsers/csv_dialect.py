@@ -0,0 +1,231 @@
+"""
+CSV Dialect - Sniffs encoding, delimiter, header offset and decimal mark from the head of a CSV file
+"""
+
+import re
+import csv
+import codecs
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, Tuple, NamedTuple
+
+import pandas as pd
+
+# The pyarrow CSV reader is several times faster than the C engine when available
+try:
+    import pyarrow
+    from pyarrow import csv as pyarrow_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Number of leading bytes sniffed
+SNIFF_BYTES = 64 * 1024
+
+# Delimiters tried, in order of preference on ties
+DELIMITERS = [',', ';', '\t', '|']
+
+# Maximum number of preamble lines (account number, period, ...) before the header
+MAX_PREAMBLE_LINES = 30
+
+# Byte order marks and the encodings that consume them
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Amount-like values with a decimal comma (1.234,56) or a decimal point (1,234.56)
+_DECIMAL_COMMA = re.compile(r'^[-+(]?[^\d,.]*\d{1,3}(?:\.?\d{3})*,\d{2}\)?-?$')
+_DECIMAL_POINT = re.compile(r'^[-+(]?[^\d,.]*\d{1,3}(?:,?\d{3})*\.\d{2}\)?-?$')
+
+
+class CSVDialect(NamedTuple):
+    """How to read a CSV statement"""
+    encoding: str = 'utf-8'
+    delimiter: str = ','
+    skiprows: int = 0     # Preamble lines before the header row
+    decimal: str = '.'    # Decimal mark of the amounts
+    
+    def read_csv_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for pandas.read_csv (C engine)
+        
+        All columns are read as text (dtype=str), so values keep their
+        original text; the parsers convert dates and amounts themselves.
+        
+        Returns:
+            Dictionary of read_csv arguments
+        """
+        return {
+            'sep': self.delimiter,
+            'encoding': self.encoding,
+            'skiprows': self.skiprows,
+            'dtype': str,
+        }
+    
+    def read_table(self, file_path: Union[str, Path], usecols: Optional[List[Any]] = None) -> pd.DataFrame:
+        """
+        Read a whole CSV file with every column as text
+        
+        pandas' pyarrow engine infers column types and only casts them back
+        to text afterwards (00123 becomes 123, -4.50 becomes -4.5), so the
+        pyarrow reader is called directly with every column declared a string.
+        The result matches the C engine's, which is used without pyarrow.
+        
+        Args:
+            file_path: Path to the CSV file
+            usecols: Optional columns to read
+        
+        Returns:
+            DataFrame of text columns
+        """
+        # pyarrow counts skipped rows differently around blank lines, so it only
+        # reads files whose header is the first line
+        if PYARROW_AVAILABLE and self.skiprows == 0:
+            try:
+                return self._read_table_pyarrow(file_path, usecols)
+            except Exception:
+                # pyarrow is stricter (e.g. about ragged rows); fall back to the C engine
+                pass
+        
+        kwargs = self.read_csv_kwargs()
+        if usecols is not None:
+            kwargs['usecols'] = usecols
+        return pd.read_csv(file_path, **kwargs)
+    
+    def _read_table_pyarrow(self, file_path: Union[str, Path], usecols: Optional[List[Any]] = None) -> pd.DataFrame:
+        # Take the header as pandas reads it (blank and repeated names made unique), then skip it
+        columns = pd.read_csv(file_path, nrows=0, **self.read_csv_kwargs()).columns.tolist()
+        
+        table = pyarrow_csv.read_csv(
+            file_path,
+            read_options=pyarrow_csv.ReadOptions(encoding=self.encoding, skip_rows=1, column_names=columns),
+            parse_options=pyarrow_csv.ParseOptions(delimiter=self.delimiter),
+            convert_options=pyarrow_csv.ConvertOptions(
+                column_types={column: pyarrow.string() for column in columns},
+                strings_can_be_null=True,
+                include_columns=usecols
+            )
+        )
+        return table.to_pandas()
+
+
+def sniff_csv(file_path: Union[str, Path], sample_bytes: int = SNIFF_BYTES) -> CSVDialect:
+    """
+    Sniff the dialect of a CSV file from its first bytes
+    
+    Args:
+        file_path: Path to the CSV file
+        sample_bytes: Number of leading bytes to read
+    
+    Returns:
+        CSVDialect (defaults for anything that cannot be determined)
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(sample_bytes)
+        complete = not f.read(1)
+    
+    return sniff_bytes(head, complete)
+
+
+def sniff_bytes(head: bytes, complete: bool = False) -> CSVDialect:
+    """
+    Sniff the dialect of CSV content
+    
+    Args:
+        head: Leading bytes of the file
+        complete: The bytes are the whole file (so the last line is not cut off)
+    
+    Returns:
+        CSVDialect
+    """
+    encoding = detect_encoding(head)
+    
+    # Ignore a character cut off at the end of the head
+    text = head.decode(encoding, errors='ignore')
+    
+    lines = text.splitlines()
+    if not complete and len(lines) > 1:
+        lines = lines[:-1]
+    
+    layout = detect_layout(lines)
+    if layout is None:
+        return CSVDialect(encoding=encoding)
+    
+    delimiter, header_index = layout
+    rows = list(csv.reader(lines[header_index + 1:], delimiter=delimiter))
+    
+    return CSVDialect(encoding, delimiter, header_index, detect_decimal(rows))
+
+
+def detect_encoding(head: bytes) -> str:
+    """Pick the encoding from a byte order mark, else UTF-8 if it decodes, else Windows-1252/Latin-1"""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    
+    try:
+        # The head may end inside a multi-byte character
+        head.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        if e.start >= len(head) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+    
+    try:
+        head.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        # Latin-1 decodes any byte sequence
+        return 'latin-1'
+
+
+def detect_layout(lines: List[str]) -> Optional[Tuple[str, int]]:
+    """
+    Find the delimiter and the header row of a table, skipping any preamble
+    
+    The delimiter is the one that splits the most lines into the same number
+    (more than one) of fields; the header is the first line with that width.
+    
+    Args:
+        lines: Leading lines of the file
+    
+    Returns:
+        Tuple of (delimiter, header line index), or None if no table was found
+    """
+    best = None  # (matching lines, delimiter, header index)
+    
+    for delimiter in DELIMITERS:
+        widths = [
+            len(next(csv.reader([line], delimiter=delimiter), [])) if line.strip() else 0
+            for line in lines
+        ]
+        
+        counts = Counter(width for width in widths if width > 1)
+        if not counts:
+            continue
+        width, matches = counts.most_common(1)[0]
+        
+        header_index = widths.index(width)
+        if header_index > MAX_PREAMBLE_LINES:
+            continue
+        
+        if best is None or matches > best[0]:
+            best = (matches, delimiter, header_index)
+    
+    return (best[1], best[2]) if best else None
+
+
+def detect_decimal(rows: List[List[str]]) -> str:
+    """Return ',' if amount-like values predominantly use a decimal comma, else '.'"""
+    comma = point = 0
+    for row in rows:
+        for value in row:
+            value = value.strip()
+            if _DECIMAL_COMMA.match(value):
+                comma += 1
+            elif _DECIMAL_POINT.match(value):
+                point += 1
+    return ',' if comma > point else '.'
@@ -5,17 +5,81 @@ CSV Parser - Parser for CSV bank statements
 import csv
 import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterator
 
 import pandas as pd
 
-from parsers.base_parser import BaseParser
-from utils.date_utils import parse_date
+from parsers.base_parser import BaseParser, DEFAULT_CHUNK_ROWS
+from parsers.transaction_batch import TransactionBatch
+from parsers.raw_rows import RawRowSource
+from parsers.schema_inference import ColumnSchema, default_inferer, SAMPLE_ROWS
+from parsers.csv_dialect import CSVDialect, sniff_csv
+from utils.date_utils import parse_dates
+
+
+# Delimiters recognised when sniffing CSV content
+SNIFF_DELIMITERS = ',;\t|'
+
+# Number of leading lines compared when sniffing CSV content
+SNIFF_LINES = 5
 
 
 class CSVParser(BaseParser):
     """Parser for CSV bank statements"""
     
+    EXTENSIONS = ('.csv',)
+    
+    # Columns identified in the last parsed file
+    schema: Optional[ColumnSchema] = None
+    
+    def __init__(self, lazy_raw_data: bool = False, include_raw_data: bool = True):
+        """
+        Initialize the CSV parser
+        
+        Args:
+            lazy_raw_data: Keep only (source, row offset) references in raw_data and
+                           re-read the original row from the file when it is accessed
+            include_raw_data: Attach the original row to each transaction as raw_data
+        """
+        self.lazy_raw_data = lazy_raw_data
+        self.include_raw_data = include_raw_data
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'CSVParser':
+        return cls(
+            lazy_raw_data=options.get('lazy_raw_data', False),
+            include_raw_data=options.get('include_raw_data', True)
+        )
+    
+    def options(self) -> Dict[str, Any]:
+        return {'lazy_raw_data': self.lazy_raw_data, 'include_raw_data': self.include_raw_data}
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """Text without NUL bytes whose first lines split into the same number of fields (> 1)"""
+        if not head_bytes or b'\x00' in head_bytes:
+            return False
+        
+        try:
+            text = head_bytes.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            # The head may end inside a multi-byte character, or the file may be Latin-1
+            text = head_bytes.decode('latin-1')
+        
+        # The last line may be cut off by the head size
+        lines = [line for line in text.splitlines() if line.strip()]
+        if len(lines) > 1:
+            lines = lines[:-1]
+        lines = lines[:SNIFF_LINES]
+        if not lines:
+            return False
+        
+        for delimiter in SNIFF_DELIMITERS:
+            widths = {len(row) for row in csv.reader(lines, delimiter=delimiter)}
+            if len(widths) == 1 and widths.pop() > 1:
+                return True
+        return False
+    
     def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """
         Parse a CSV bank statement file
@@ -26,114 +90,184 @@ class CSVParser(BaseParser):
         Returns:
             List of standardized transaction dictionaries
         """
+        return self.parse_columnar(file_path).to_dicts()
+    
+    def parse_columnar(self, file_path: Union[str, Path]) -> TransactionBatch:
+        """
+        Parse a CSV bank statement file into a columnar transaction batch
+        
+        Dates, descriptions and amounts are converted with whole-column
+        operations instead of row by row. Unless raw_data keeps whole rows in
+        memory, only the date, description and amount columns are read.
+        
+        Args:
+            file_path: Path to the CSV bank statement file
+        
+        Returns:
+            TransactionBatch with the parsed transactions
+        """
         try:
-            # Try to detect the CSV format automatically
-            df = pd.read_csv(file_path)
+            # Sniff encoding, delimiter and header offset once, then read with explicit settings
+            dialect = sniff_csv(file_path)
             
-            # Try to identify the columns based on common naming patterns
-            date_col = self._find_column(df, ['date', 'transaction date', 'posted date'])
-            desc_col = self._find_column(df, ['description', 'payee', 'merchant', 'transaction'])
-            amount_col = self._find_column(df, ['amount', 'transaction amount'])
+            if self._projected:
+                # Infer the columns from the head, then read only those
+                schema = self._detect_columns(self._read_head(file_path, dialect))
+                df = self._read_csv(file_path, dialect, usecols=schema.columns)
+            else:
+                df = self._read_csv(file_path, dialect)
+                schema = self._detect_columns(df)
             
-            # If we couldn't find the essential columns, try to infer them
-            if not all([date_col, desc_col, amount_col]):
-                # Infer columns based on content
-                for col in df.columns:
-                    # Check if column contains dates
-                    if not date_col and self._is_date_column(df[col]):
-                        date_col = col
-                    # Check if column contains mostly text (descriptions)
-                    elif not desc_col and self._is_description_column(df[col]):
-                        desc_col = col
-                    # Check if column contains monetary values
-                    elif not amount_col and self._is_amount_column(df[col]):
-                        amount_col = col
+            batch = self._build_batch(df, schema, self._raw_source(file_path, dialect), dialect.decimal)
+            self.rejected_amounts = batch.rejected_amounts
+            self.schema = schema
             
-            if not all([date_col, desc_col, amount_col]):
-                raise ValueError("Could not identify required columns in CSV file")
+            return batch
             
-            # Process transactions
-            transactions = []
-            for _, row in df.iterrows():
-                # Parse date
-                date_str = str(row[date_col])
-                date = parse_date(date_str)
-                
-                # Parse description
-                description = str(row[desc_col]).strip()
-                
-                # Parse amount
-                amount = self._parse_amount(row[amount_col])
-                
-                # Create standardized transaction
-                transaction = {
-                    'date': date,
-                    'description': description,
-                    'amount': amount,
-                    'raw_data': row.to_dict()  # Store original data for reference
-                }
-                
-                transactions.append(transaction)
+        except Exception as e:
+            raise ValueError(f"Failed to parse CSV file: {e}")
+    
+    def iter_parse(
+        self,
+        file_path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[TransactionBatch]:
+        """
+        Stream a CSV bank statement file as transaction batches
+        
+        Columns are detected once from the first chunk and reused for the
+        rest of the file, so only one chunk is held in memory at a time.
+        
+        Args:
+            file_path: Path to the CSV bank statement file
+            chunk_rows: Maximum number of rows read per batch
+        
+        Yields:
+            TransactionBatch objects in file order
+        """
+        try:
+            schema = None
+            dialect = sniff_csv(file_path)
+            raw_source = self._raw_source(file_path, dialect)
+            self.rejected_amounts = 0
             
-            return transactions
+            kwargs = dialect.read_csv_kwargs()
+            if self._projected:
+                schema = self._detect_columns(self._read_head(file_path, dialect))
+                kwargs['usecols'] = schema.columns
             
+            with pd.read_csv(file_path, chunksize=chunk_rows, **kwargs) as reader:
+                for chunk in reader:
+                    if schema is None:
+                        schema = self._detect_columns(chunk)
+                    batch = self._build_batch(chunk, schema, raw_source, dialect.decimal)
+                    self.rejected_amounts += batch.rejected_amounts
+                    yield batch
+        
         except Exception as e:
             raise ValueError(f"Failed to parse CSV file: {e}")
     
-    def _find_column(self, df: pd.DataFrame, possible_names: List[str]) -> Optional[str]:
-        """Find a column in the DataFrame based on possible names"""
-        for name in possible_names:
-            for col in df.columns:
-                if name.lower() in col.lower():
-                    return col
-        return None
-    
-    def _is_date_column(self, series: pd.Series) -> bool:
-        """Check if a column contains dates"""
+    def parse_tail(
+        self,
+        file_path: Union[str, Path],
+        byte_offset: int,
+        columns: List[str],
+        schema: ColumnSchema,
+        dialect: CSVDialect,
+        first_row: int = 0
+    ) -> TransactionBatch:
+        """
+        Parse only the rows that start at a byte offset, e.g. rows appended since an earlier parse
+        
+        Args:
+            file_path: Path to the CSV bank statement file
+            byte_offset: Position of the first new row (the start of a line)
+            columns: Column names from the file's header row
+            schema: Columns identified by the earlier parse
+            dialect: Dialect sniffed by the earlier parse
+            first_row: Number of data rows before the offset, so raw row offsets stay file-wide
+        
+        Returns:
+            TransactionBatch with the rows after the offset
+        """
         try:
-            # Try to convert to datetime
-            pd.to_datetime(series, errors='raise')
-            return True
-        except:
-            return False
-    
-    def _is_description_column(self, series: pd.Series) -> bool:
-        """Check if a column contains mostly text (descriptions)"""
-        # Check if column has string type and longer text values
-        if series.dtype == 'object':
-            # Check average string length
-            avg_len = series.astype(str).str.len().mean()
-            return avg_len > 10
-        return False
+            kwargs = dialect.read_csv_kwargs()
+            kwargs.update(skiprows=0, header=None, names=columns)
+            if self._projected:
+                kwargs['usecols'] = schema.columns
+            
+            with open(file_path, 'rb') as f:
+                f.seek(byte_offset)
+                df = pd.read_csv(f, **kwargs)
+            df.index = range(first_row, first_row + len(df))
+            
+            batch = self._build_batch(df, schema, self._raw_source(file_path, dialect), dialect.decimal)
+            self.rejected_amounts = batch.rejected_amounts
+            
+            return batch
+        
+        except Exception as e:
+            raise ValueError(f"Failed to parse CSV file: {e}")
     
-    def _is_amount_column(self, series: pd.Series) -> bool:
-        """Check if a column contains monetary values"""
-        try:
-            # Try to convert to numeric
-            numeric_series = pd.to_numeric(series, errors='coerce')
-            # Check if most values are not NaN
-            return numeric_series.notna().mean() > 0.7
-        except:
-            return False
+    def _detect_columns(self, df: pd.DataFrame) -> ColumnSchema:
+        """Identify the date, description and amount columns of a statement"""
+        schema = default_inferer.infer(df)
+        
+        if schema is None:
+            raise ValueError("Could not identify required columns in CSV file")
+        
+        return schema
     
-    def _parse_amount(self, amount_value: Any) -> float:
-        """Parse amount value to float"""
-        if isinstance(amount_value, (int, float)):
-            return float(amount_value)
+    def _build_batch(
+        self,
+        df: pd.DataFrame,
+        schema: ColumnSchema,
+        raw_source: Optional[RawRowSource] = None,
+        decimal: str = '.'
+    ) -> TransactionBatch:
+        """Convert the identified columns of a DataFrame into a transaction batch"""
+        if raw_source is not None:
+            # Only remember where each row came from; the chunk index is the row position in the file
+            raw = {'raw_source': raw_source, 'raw_offsets': df.index.to_numpy()}
+        elif self.include_raw_data:
+            raw = {'raw_data': df}  # Store original data for reference
+        else:
+            raw = {}
         
-        # Handle string amounts
-        if isinstance(amount_value, str):
-            # Remove currency symbols and commas
-            clean_amount = amount_value.replace('$', '').replace(',', '').strip()
-            
-            # Handle parentheses for negative values: (123.45) -> -123.45
-            if clean_amount.startswith('(') and clean_amount.endswith(')'):
-                clean_amount = '-' + clean_amount[1:-1]
-                
-            try:
-                return float(clean_amount)
-            except ValueError:
-                pass
-        
-        # Default fallback
-        return 0.0
+        amounts, rejected = self._amount_column(df, schema, decimal)
+        
+        return TransactionBatch(
+            self._parse_dates(df[schema.date]),
+            df[schema.description].astype(str).str.strip(),
+            amounts,
+            rejected_amounts=rejected,
+            **raw
+        )
+    
+    @property
+    def _projected(self) -> bool:
+        """Whether only the transaction columns are read (raw rows are re-read lazily or dropped)"""
+        return self.lazy_raw_data or not self.include_raw_data
+    
+    def _read_head(self, file_path: Union[str, Path], dialect: CSVDialect) -> pd.DataFrame:
+        """Read the rows sampled by schema inference"""
+        return pd.read_csv(file_path, nrows=SAMPLE_ROWS, **dialect.read_csv_kwargs())
+    
+    def _read_csv(
+        self,
+        file_path: Union[str, Path],
+        dialect: CSVDialect,
+        usecols: Optional[List[Any]] = None
+    ) -> pd.DataFrame:
+        """Read a whole CSV file with the sniffed dialect, optionally only some columns"""
+        return dialect.read_table(file_path, usecols)
+    
+    def _raw_source(self, file_path: Union[str, Path], dialect: CSVDialect) -> Optional[RawRowSource]:
+        """Return the lazy raw row source for a file, or None when raw rows are kept in memory"""
+        if not self.lazy_raw_data or not self.include_raw_data:
+            return None
+        return RawRowSource.for_file(file_path, lambda: self._read_csv(file_path, dialect))
+    
+    def _parse_dates(self, series: pd.Series) -> List[Optional[datetime.date]]:
+        """Parse a date column with a format inferred from the column itself"""
+        return parse_dates(series.astype(str).tolist())
@@ -3,18 +3,66 @@ Excel Parser - Parser for Excel bank statements
 """
 
 import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterator, Tuple
 
+import openpyxl
 import pandas as pd
 
-from parsers.base_parser import BaseParser
-from utils.date_utils import parse_date
+from parsers.base_parser import BaseParser, DEFAULT_CHUNK_ROWS
+from parsers.raw_rows import RawRowSource, LazyRawRow
+from parsers.schema_inference import ColumnSchema, default_inferer
+from parsers.transaction_batch import TransactionBatch
+from utils.date_utils import parse_date, parse_dates
+
+
+# Sheet names that usually hold the transactions, in order of preference
+TRANSACTION_SHEET_NAMES = ['transactions', 'statement', 'activity', 'account']
+
+# Number of leading rows searched for a sheet's header row
+HEADER_SEARCH_ROWS = 20
+
+# File signatures: .xlsx workbooks are zip archives, .xls files OLE2 compound documents
+XLSX_MAGIC = b'PK\x03\x04'
+XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
 
 
 class ExcelParser(BaseParser):
     """Parser for Excel bank statements"""
     
+    EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+    MAGIC = (XLSX_MAGIC, XLS_MAGIC)
+    
+    def __init__(self, lazy_raw_data: bool = False, include_raw_data: bool = True):
+        """
+        Initialize the Excel parser
+        
+        Args:
+            lazy_raw_data: Keep only (source, row offset) references in raw_data and
+                           re-read the original row from the workbook when it is accessed
+            include_raw_data: Attach the original row to each transaction as raw_data
+        """
+        self.lazy_raw_data = lazy_raw_data
+        self.include_raw_data = include_raw_data
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'ExcelParser':
+        return cls(
+            lazy_raw_data=options.get('lazy_raw_data', False),
+            include_raw_data=options.get('include_raw_data', True)
+        )
+    
+    def options(self) -> Dict[str, Any]:
+        return {'lazy_raw_data': self.lazy_raw_data, 'include_raw_data': self.include_raw_data}
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """Legacy .xls compound documents, or zip archives holding an xl/ workbook part"""
+        if head_bytes.startswith(XLS_MAGIC):
+            return True
+        return head_bytes.startswith(XLSX_MAGIC) and b'xl/' in head_bytes
+    
     def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """
         Parse an Excel bank statement file
@@ -25,6 +73,230 @@ class ExcelParser(BaseParser):
         Returns:
             List of standardized transaction dictionaries
         """
+        # openpyxl cannot read legacy .xls workbooks
+        if _is_legacy_xls(file_path):
+            return self._parse_with_pandas(file_path)
+        
+        transactions = []
+        for batch in self.iter_parse(file_path):
+            transactions.extend(batch.to_dicts())
+        return transactions
+    
+    def iter_parse(
+        self,
+        file_path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[TransactionBatch]:
+        """
+        Stream an Excel bank statement file as transaction batches
+        
+        The workbook is opened once in read-only mode, the transaction sheet is
+        picked from its header row, and rows are streamed out chunk by chunk.
+        Unless raw_data keeps whole rows in memory, chunks after the first only
+        hold the date, description and amount columns.
+        
+        Args:
+            file_path: Path to the Excel bank statement file
+            chunk_rows: Maximum number of rows read per batch
+        
+        Yields:
+            TransactionBatch objects in sheet order
+        """
+        if _is_legacy_xls(file_path):
+            yield from super().iter_parse(file_path, chunk_rows)
+            return
+        
+        try:
+            # Pass a file object: openpyxl rejects paths without an Excel extension
+            with open(file_path, 'rb') as f:
+                workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+                try:
+                    sheet_name, header_index, header = self._find_transaction_sheet(workbook)
+                    rows = workbook[sheet_name].iter_rows(min_row=header_index + 2, values_only=True)
+                    
+                    raw_source = None
+                    if self.lazy_raw_data and self.include_raw_data:
+                        raw_source = RawRowSource.for_file(
+                            file_path, lambda: self._read_sheet(file_path, sheet_name, header_index, header)
+                        )
+                    
+                    schema = None
+                    positions = None
+                    offset = 0
+                    self.rejected_amounts = 0
+                    
+                    while True:
+                        chunk = list(islice(rows, chunk_rows))
+                        if not chunk:
+                            break
+                        
+                        # The index is the row position after the header, used for lazy raw rows
+                        df = self._frame(chunk, header, positions)
+                        df.index = range(offset, offset + len(df))
+                        offset += len(df)
+                        
+                        # Identify the date, description and amount columns once
+                        if schema is None:
+                            schema = default_inferer.infer(df)
+                            if schema is None:
+                                raise ValueError("Could not identify required columns in Excel file")
+                            if self._projected:
+                                positions = self._column_positions(header, schema)
+                        
+                        batch = self._build_batch(df, schema, raw_source)
+                        self.rejected_amounts += batch.rejected_amounts
+                        yield batch
+                finally:
+                    workbook.close()
+        
+        except Exception as e:
+            raise ValueError(f"Failed to parse Excel file: {e}")
+    
+    def _find_transaction_sheet(self, workbook: Any) -> Tuple[str, int, List[str]]:
+        """
+        Pick the sheet holding the transactions and locate its header row
+        
+        Sheets whose names suggest transactions are checked first; the first
+        sheet with a recognisable header row wins.
+        
+        Args:
+            workbook: Workbook opened with openpyxl
+        
+        Returns:
+            Tuple of (sheet name, zero-based header row index, header cells)
+        """
+        sheet_names = workbook.sheetnames
+        if not sheet_names:
+            raise ValueError("No sheets found in Excel file")
+        
+        preferred = [
+            sheet for name in TRANSACTION_SHEET_NAMES
+            for sheet in sheet_names if name in sheet.lower()
+        ]
+        candidates = list(dict.fromkeys(preferred + sheet_names))
+        
+        for sheet_name in candidates:
+            head = workbook[sheet_name].iter_rows(max_row=HEADER_SEARCH_ROWS, values_only=True)
+            for index, values in enumerate(head):
+                cells = [v for v in values if v is not None]
+                if cells and self._is_header_row(cells):
+                    return sheet_name, index, self._header(values)
+        
+        # No header row found anywhere: use the first non-empty row of the best sheet
+        sheet_name = candidates[0]
+        head = workbook[sheet_name].iter_rows(max_row=HEADER_SEARCH_ROWS, values_only=True)
+        for index, values in enumerate(head):
+            if any(v is not None for v in values):
+                return sheet_name, index, self._header(values)
+        
+        raise ValueError(f"Sheet '{sheet_name}' is empty")
+    
+    def _header(self, values: Tuple[Any, ...]) -> List[str]:
+        """Turn header cells into column names, naming blank cells like pandas does"""
+        return [
+            str(value).strip() if value is not None else f'Unnamed: {i}'
+            for i, value in enumerate(values)
+        ]
+    
+    def _frame(
+        self,
+        rows: List[Tuple[Any, ...]],
+        header: List[str],
+        positions: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Build a DataFrame from sheet rows, padding or trimming them to the header width
+        
+        Args:
+            rows: Cell values of each sheet row
+            header: Column names
+            positions: Only keep the cells at these column positions
+        
+        Returns:
+            DataFrame of object columns
+        """
+        if positions is not None:
+            return pd.DataFrame(
+                [tuple(row[i] if i < len(row) else None for i in positions) for row in rows],
+                columns=[header[i] for i in positions]
+            )
+        
+        width = len(header)
+        return pd.DataFrame(
+            [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows],
+            columns=header
+        )
+    
+    @property
+    def _projected(self) -> bool:
+        """Whether only the transaction columns are kept (raw rows are re-read lazily or dropped)"""
+        return self.lazy_raw_data or not self.include_raw_data
+    
+    def _column_positions(self, header: List[str], schema: ColumnSchema) -> Optional[List[int]]:
+        """Positions of the schema columns in the header, or None if every column is needed"""
+        positions = [header.index(col) for col in schema.columns]
+        return positions if len(positions) < len(header) else None
+    
+    def _read_sheet(self, file_path: Union[str, Path], sheet_name: str, header_index: int, header: List[str]) -> pd.DataFrame:
+        """Re-read all data rows of a sheet with the same row positions as iter_parse"""
+        with open(file_path, 'rb') as f:
+            workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+            try:
+                rows = workbook[sheet_name].iter_rows(min_row=header_index + 2, values_only=True)
+                return self._frame(list(rows), header)
+            finally:
+                workbook.close()
+    
+    def _build_batch(
+        self,
+        df: pd.DataFrame,
+        schema: ColumnSchema,
+        raw_source: Optional[RawRowSource] = None
+    ) -> TransactionBatch:
+        """Convert a chunk of sheet rows into a transaction batch, dropping rows without a date"""
+        dates = pd.Series(self._parse_cell_dates(df[schema.date]), index=df.index, dtype=object)
+        amounts, rejected = self._amount_column(df, schema)
+        
+        # Blank rows, repeated headers and footers have no parseable date
+        keep = dates.notna()
+        df, dates, amounts = df[keep], dates[keep], amounts[keep]
+        
+        if raw_source is not None:
+            raw = {'raw_source': raw_source, 'raw_offsets': df.index.to_numpy()}
+        elif self.include_raw_data:
+            raw = {'raw_data': df}  # Store original data for reference
+        else:
+            raw = {}
+        
+        return TransactionBatch(
+            dates,
+            df[schema.description].astype(str).str.strip(),
+            amounts,
+            rejected_amounts=rejected,
+            **raw
+        )
+    
+    def _parse_cell_dates(self, series: pd.Series) -> List[Optional[datetime.date]]:
+        """Convert date cells (datetime values or text) to dates"""
+        values = series.tolist()
+        
+        # Text cells are parsed together so the column's date format is inferred once
+        text_dates = iter(parse_dates([v for v in values if isinstance(v, str)]))
+        
+        dates = []
+        for value in values:
+            if isinstance(value, datetime.datetime):
+                dates.append(value.date())
+            elif isinstance(value, datetime.date):
+                dates.append(value)
+            elif isinstance(value, str):
+                dates.append(next(text_dates))
+            else:
+                dates.append(None)
+        return dates
+    
+    def _parse_with_pandas(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Parse a workbook through pandas (used for legacy .xls files)"""
         try:
             # Try to read all sheets
             excel_file = pd.ExcelFile(file_path)
@@ -51,33 +323,30 @@ class ExcelParser(BaseParser):
             # Read the transaction sheet
             df = pd.read_excel(file_path, sheet_name=transaction_sheet)
             
-            # Try to identify the columns based on common naming patterns
-            date_col = self._find_column(df, ['date', 'transaction date', 'posted date'])
-            desc_col = self._find_column(df, ['description', 'payee', 'merchant', 'transaction'])
-            amount_col = self._find_column(df, ['amount', 'transaction amount'])
-            
-            # If we couldn't find the essential columns, try to infer them
-            if not all([date_col, desc_col, amount_col]):
-                # Infer columns based on content
-                for col in df.columns:
-                    # Check if column contains dates
-                    if not date_col and self._is_date_column(df[col]):
-                        date_col = col
-                    # Check if column contains mostly text (descriptions)
-                    elif not desc_col and self._is_description_column(df[col]):
-                        desc_col = col
-                    # Check if column contains monetary values
-                    elif not amount_col and self._is_amount_column(df[col]):
-                        amount_col = col
+            # Identify the date, description and amount columns
+            schema = default_inferer.infer(df)
             
-            if not all([date_col, desc_col, amount_col]):
+            if schema is None:
                 raise ValueError("Could not identify required columns in Excel file")
             
+            date_col, desc_col = schema.date, schema.description
+            
+            # Normalize the whole amount column (or debit/credit pair) at once
+            amounts, self.rejected_amounts = self._amount_column(df, schema)
+            amounts = amounts.tolist()
+            
+            # Re-read the sheet on demand instead of copying every row into raw_data
+            raw_source = None
+            if self.lazy_raw_data:
+                raw_source = RawRowSource.for_file(
+                    file_path, lambda: pd.read_excel(file_path, sheet_name=transaction_sheet)
+                )
+            
             # Process transactions
             transactions = []
-            for _, row in df.iterrows():
+            for row_offset, (_, row) in enumerate(df.iterrows()):
                 # Skip header rows or empty rows
-                if self._is_header_row(row):
+                if self._is_header_row(row.values):
                     continue
                 
                 # Parse date
@@ -98,93 +367,28 @@ class ExcelParser(BaseParser):
                 description = str(row[desc_col]).strip()
                 
                 # Parse amount
-                amount = self._parse_amount(row[amount_col])
+                amount = amounts[row_offset]
                 
                 # Create standardized transaction
                 transaction = {
                     'date': date,
                     'description': description,
-                    'amount': amount,
-                    'raw_data': row.to_dict()  # Store original data for reference
+                    'amount': amount
                 }
                 
+                # Store original data for reference
+                if self.include_raw_data:
+                    transaction['raw_data'] = LazyRawRow(raw_source, row_offset) if raw_source else row.to_dict()
+                
                 transactions.append(transaction)
             
             return transactions
             
         except Exception as e:
             raise ValueError(f"Failed to parse Excel file: {e}")
-    
-    def _find_column(self, df: pd.DataFrame, possible_names: List[str]) -> Optional[str]:
-        """Find a column in the DataFrame based on possible names"""
-        for name in possible_names:
-            for col in df.columns:
-                if isinstance(col, str) and name.lower() in col.lower():
-                    return col
-        return None
-    
-    def _is_date_column(self, series: pd.Series) -> bool:
-        """Check if a column contains dates"""
-        # Check if column has datetime type
-        if pd.api.types.is_datetime64_any_dtype(series):
-            return True
-            
-        try:
-            # Try to convert to datetime
-            pd.to_datetime(series, errors='raise')
-            return True
-        except:
-            return False
-    
-    def _is_description_column(self, series: pd.Series) -> bool:
-        """Check if a column contains mostly text (descriptions)"""
-        # Check if column has string type and longer text values
-        if series.dtype == 'object':
-            # Check average string length
-            avg_len = series.astype(str).str.len().mean()
-            return avg_len > 10
-        return False
-    
-    def _is_amount_column(self, series: pd.Series) -> bool:
-        """Check if a column contains monetary values"""
-        try:
-            # Try to convert to numeric
-            numeric_series = pd.to_numeric(series, errors='coerce')
-            # Check if most values are not NaN
-            return numeric_series.notna().mean() > 0.7
-        except:
-            return False
-    
-    def _is_header_row(self, row: pd.Series) -> bool:
-        """Check if a row is likely a header row"""
-        # Convert all values to string and lowercase
-        values = [str(v).lower() for v in row.values]
-        
-        # Check for common header terms
-        header_terms = ['date', 'description', 'amount', 'balance', 'transaction']
-        matches = sum(1 for term in header_terms if any(term in v for v in values))
-        
-        # If multiple header terms are found, it's likely a header row
-        return matches >= 2
-    
-    def _parse_amount(self, amount_value: Any) -> float:
-        """Parse amount value to float"""
-        if isinstance(amount_value, (int, float)):
-            return float(amount_value)
-        
-        # Handle string amounts
-        if isinstance(amount_value, str):
-            # Remove currency symbols and commas
-            clean_amount = amount_value.replace('$', '').replace(',', '').strip()
-            
-            # Handle parentheses for negative values: (123.45) -> -123.45
-            if clean_amount.startswith('(') and clean_amount.endswith(')'):
-                clean_amount = '-' + clean_amount[1:-1]
-                
-            try:
-                return float(clean_amount)
-            except ValueError:
-                pass
-        
-        # Default fallback
-        return 0.0
+
+
+def _is_legacy_xls(file_path: Union[str, Path]) -> bool:
+    """Whether a file is a legacy .xls compound document rather than an .xlsx archive"""
+    with open(file_path, 'rb') as f:
+        return f.read(len(XLS_MAGIC)) == XLS_MAGIC
@@ -0,0 +1,222 @@
+"""
+Incremental Ingestion - Parses only the rows appended to a growing CSV export
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, NamedTuple, Tuple
+
+import pandas as pd
+
+from parsers.csv_parser import CSVParser
+from parsers.csv_dialect import CSVDialect, sniff_csv
+from parsers.parser_factory import ParserFactory
+from parsers.parse_cache import ParseCache
+from parsers.schema_inference import ColumnSchema
+from utils.file_utils import atomic_write
+
+
+# Default location of the per-source ingestion state
+DEFAULT_STATE_DIR = os.path.join(tempfile.gettempdir(), 'fintech_incremental')
+
+# Block size used when hashing the already parsed prefix
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Maximum number of bytes of the last parsed row that are hashed
+LAST_ROW_BYTES = 64 * 1024
+
+# Encodings whose byte stream cannot be decoded from an arbitrary line start
+_UNSEEKABLE_ENCODINGS = ('utf-16',)
+
+
+class SourceState(NamedTuple):
+    """What was parsed of a source the last time it was ingested"""
+    parser_version: str
+    byte_offset: int              # Number of bytes parsed
+    prefix_hash: str              # SHA-256 of the first byte_offset bytes
+    last_row_hash: str            # SHA-256 of the last parsed line
+    ends_with_newline: bool       # Whether the parsed prefix ended with a line break
+    rows: int                     # Number of data rows parsed
+    columns: List[str]            # Header row
+    schema: List[Any]             # ColumnSchema fields
+    dialect: List[Any]            # CSVDialect fields
+
+
+class IncrementalResult(NamedTuple):
+    """Transactions produced by one incremental ingestion"""
+    transactions: List[Dict[str, Any]]
+    appended: bool                # True if transactions only holds the rows added since the last ingestion
+
+
+class IncrementalIngestor:
+    """Remembers how far each source was parsed and only parses what was appended since"""
+    
+    def __init__(
+        self,
+        state_dir: Union[str, Path] = DEFAULT_STATE_DIR,
+        parser_factory: Optional[ParserFactory] = None,
+        parse_cache: Optional[ParseCache] = None
+    ):
+        """
+        Initialize the incremental ingestor
+        
+        Args:
+            state_dir: Directory that holds one state file per source
+            parser_factory: Factory used to pick and configure parsers
+            parse_cache: Cache used for the full parses of non-CSV statements
+        """
+        self.state_dir = Path(state_dir)
+        self.parser_factory = parser_factory or ParserFactory()
+        self.parse_cache = parse_cache
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+    
+    def ingest(self, file_path: Union[str, Path], source_id: Optional[str] = None) -> IncrementalResult:
+        """
+        Parse a statement, or only its new rows if it grew since the last ingestion
+        
+        The tail is parsed when the file still starts with exactly the bytes
+        parsed last time (checked through the last row's hash, then the hash
+        of the whole prefix). Anything else, including non-CSV statements,
+        is parsed in full.
+        
+        Args:
+            file_path: Path to the bank statement file
+            source_id: Identifier of the running export (defaults to the absolute path),
+                       e.g. the account, when each upload is saved under a new name
+        
+        Returns:
+            IncrementalResult with either the appended or all transactions
+        """
+        source_id = source_id or os.path.abspath(file_path)
+        parser = self.parser_factory.get_parser(file_path)
+        
+        if not isinstance(parser, CSVParser):
+            self.forget(source_id)
+            if self.parse_cache is not None:
+                return IncrementalResult(self.parse_cache.parse(file_path, parser), False)
+            return IncrementalResult(parser.parse(file_path), False)
+        
+        state = self._load_state(source_id)
+        if state is not None and state.parser_version == parser.PARSER_VERSION:
+            result = self._ingest_tail(file_path, source_id, parser, state)
+            if result is not None:
+                return result
+        
+        return self._ingest_full(file_path, source_id, parser)
+    
+    def forget(self, source_id: str) -> None:
+        """Drop the state of a source, so its next ingestion is a full parse"""
+        self._state_path(source_id).unlink(missing_ok=True)
+    
+    def _ingest_full(self, file_path: Union[str, Path], source_id: str, parser: CSVParser) -> IncrementalResult:
+        """Parse the whole file and remember where it ended"""
+        size = os.path.getsize(file_path)
+        dialect = sniff_csv(file_path)
+        batch = parser.parse_columnar(file_path)
+        
+        if dialect.encoding in _UNSEEKABLE_ENCODINGS or size == 0:
+            self.forget(source_id)
+            return IncrementalResult(batch.to_dicts(), False)
+        
+        columns = pd.read_csv(file_path, nrows=0, **dialect.read_csv_kwargs()).columns.tolist()
+        
+        with open(file_path, 'rb') as f:
+            digest = _hash_range(f, 0, size)
+            last_row_hash, ends_with_newline = _last_row(f, size)
+        
+        self._save_state(source_id, SourceState(
+            parser.PARSER_VERSION, size, digest.hexdigest(), last_row_hash, ends_with_newline,
+            len(batch), columns, list(parser.schema), list(dialect)
+        ))
+        return IncrementalResult(batch.to_dicts(), False)
+    
+    def _ingest_tail(
+        self,
+        file_path: Union[str, Path],
+        source_id: str,
+        parser: CSVParser,
+        state: SourceState
+    ) -> Optional[IncrementalResult]:
+        """Parse the rows after the remembered offset, or return None if the prefix changed"""
+        size = os.path.getsize(file_path)
+        if size < state.byte_offset:
+            return None
+        
+        with open(file_path, 'rb') as f:
+            # Cheap check first: the last parsed row is still in place
+            if _last_row(f, state.byte_offset) != (state.last_row_hash, state.ends_with_newline):
+                return None
+            
+            digest = _hash_range(f, 0, state.byte_offset)
+            if digest.hexdigest() != state.prefix_hash:
+                return None
+            
+            if size == state.byte_offset:
+                return IncrementalResult([], True)
+            
+            # Without a final line break the last row may have been extended rather than followed
+            f.seek(state.byte_offset)
+            if not state.ends_with_newline and f.read(1) not in (b'\n', b'\r'):
+                return None
+            
+            # Continue the prefix hash over the new bytes for the next ingestion
+            _hash_range(f, state.byte_offset, size, digest)
+            last_row_hash, ends_with_newline = _last_row(f, size)
+        
+        batch = parser.parse_tail(
+            file_path, state.byte_offset, state.columns,
+            ColumnSchema(*state.schema), CSVDialect(*state.dialect), first_row=state.rows
+        )
+        
+        self._save_state(source_id, state._replace(
+            byte_offset=size,
+            prefix_hash=digest.hexdigest(),
+            last_row_hash=last_row_hash,
+            ends_with_newline=ends_with_newline,
+            rows=state.rows + len(batch)
+        ))
+        return IncrementalResult(batch.to_dicts(), True)
+    
+    def _state_path(self, source_id: str) -> Path:
+        return self.state_dir / f'{hashlib.sha256(source_id.encode()).hexdigest()}.json'
+    
+    def _load_state(self, source_id: str) -> Optional[SourceState]:
+        try:
+            with open(self._state_path(source_id)) as f:
+                return SourceState(**json.load(f))
+        except (FileNotFoundError, OSError, ValueError, TypeError):
+            return None
+    
+    def _save_state(self, source_id: str, state: SourceState) -> None:
+        try:
+            with atomic_write(self._state_path(source_id)) as f:
+                json.dump(state._asdict(), f)
+        except Exception as e:
+            print(f"Warning: Failed to write incremental ingestion state: {e}")
+
+
+def _hash_range(f: Any, start: int, end: int, digest: Optional[Any] = None) -> Any:
+    """Feed bytes [start, end) of an open binary file into a SHA-256 digest"""
+    digest = digest or hashlib.sha256()
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(HASH_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+
+def _last_row(f: Any, end: int) -> Tuple[str, bool]:
+    """Hash of the last non-empty line before a byte offset, and whether the bytes end with a line break"""
+    start = max(0, end - LAST_ROW_BYTES)
+    f.seek(start)
+    tail = f.read(end - start)
+    
+    line = tail.rstrip(b'\r\n').rsplit(b'\n', 1)[-1]
+    return hashlib.sha256(line).hexdigest(), tail.endswith((b'\n', b'\r'))
@@ -0,0 +1,219 @@
+"""
+OCR - Text extraction for scanned PDF pages, with a per-page result cache
+"""
+
+import os
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Union, Optional
+
+import pdfplumber
+
+from utils.file_utils import atomic_write, evict_least_recently_used
+
+# OCR needs pytesseract (and the tesseract binary); without it scanned PDFs cannot be read
+try:
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+
+# Rendering resolution for OCR; tesseract is most accurate around 300 DPI
+OCR_RESOLUTION = 300
+
+# Default location and size budget of the OCR result cache
+DEFAULT_OCR_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'fintech_ocr_cache')
+DEFAULT_OCR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class OCRCache:
+    """On-disk cache of OCR text keyed by page hash (and rendering resolution)"""
+    
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_OCR_CACHE_DIR, max_bytes: int = DEFAULT_OCR_CACHE_MAX_BYTES):
+        """
+        Initialize the OCR cache
+        
+        Args:
+            cache_dir: Directory that holds the cached page texts
+            max_bytes: Total size budget; least recently used entries are evicted beyond it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def get(self, page_hash: str) -> Optional[str]:
+        """Return the cached text of a page, or None on a cache miss"""
+        path = self.cache_dir / f'{page_hash}.txt'
+        try:
+            text = path.read_text(encoding='utf-8')
+            
+            # Mark the entry as recently used for LRU eviction
+            os.utime(path)
+        except (FileNotFoundError, OSError):
+            return None
+        return text
+    
+    def put(self, page_hash: str, text: str) -> None:
+        """Store the OCR text of a page and evict old entries if over the size budget"""
+        try:
+            with atomic_write(self.cache_dir / f'{page_hash}.txt', encoding='utf-8') as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Warning: Failed to write OCR cache entry: {e}")
+            return
+        
+        evict_least_recently_used(self.cache_dir, '*.txt', self.max_bytes)
+
+
+class PageOCR:
+    """Extracts page texts from a PDF, running OCR only on pages without a text layer"""
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache: Optional[OCRCache] = None,
+        resolution: int = OCR_RESOLUTION
+    ):
+        """
+        Initialize the page OCR stage
+        
+        Args:
+            workers: Number of OCR worker processes (None uses the CPU count)
+            cache: OCR result cache (None uses the default cache directory)
+            resolution: Rendering resolution in DPI
+        """
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.cache = cache if cache is not None else OCRCache()
+        self.resolution = resolution
+        
+        # Number of pages OCRed and served from the cache in the last call
+        self.pages_ocred = 0
+        self.pages_cached = 0
+    
+    def extract_texts(self, file_path: Union[str, Path]) -> List[str]:
+        """
+        Return the text of every page of a PDF
+        
+        Pages with a text layer are read directly. Image-only pages are looked
+        up in the cache by page hash and OCRed in parallel on a miss, so a
+        re-uploaded scan skips OCR entirely.
+        
+        Args:
+            file_path: Path to the PDF file
+        
+        Returns:
+            List of page texts in page order
+        
+        Raises:
+            ValueError: If a page needs OCR and pytesseract is not installed
+        """
+        texts: List[str] = []
+        scanned: List[int] = []
+        
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                if needs_ocr(page):
+                    scanned.append(page.page_number)
+                    texts.append('')
+                else:
+                    texts.append(page.extract_text() or '')
+        
+        for page_number, text in zip(scanned, self.ocr_pages(file_path, scanned)):
+            texts[page_number - 1] = text
+        
+        return texts
+    
+    def ocr_pages(self, file_path: Union[str, Path], page_numbers: List[int]) -> List[str]:
+        """
+        OCR the given pages, serving pages seen before from the cache
+        
+        Args:
+            file_path: Path to the PDF file
+            page_numbers: 1-based numbers of pages without a text layer
+        
+        Returns:
+            List of page texts aligned with page_numbers
+        
+        Raises:
+            ValueError: If a page is not cached and pytesseract is not installed
+        """
+        texts: List[Optional[str]] = []
+        missing: Dict[int, str] = {}  # position in page_numbers -> page hash
+        self.pages_cached = 0
+        
+        if page_numbers:
+            with pdfplumber.open(file_path) as pdf:
+                for position, page_number in enumerate(page_numbers):
+                    page_hash = f'{page_image_hash(pdf.pages[page_number - 1])}-{self.resolution}'
+                    text = self.cache.get(page_hash)
+                    if text is None:
+                        missing[position] = page_hash
+                    else:
+                        self.pages_cached += 1
+                    texts.append(text)
+        
+        self.pages_ocred = len(missing)
+        
+        if not missing:
+            return texts
+        
+        if not OCR_AVAILABLE:
+            raise ValueError("Scanned pages need OCR, but pytesseract is not installed")
+        
+        ocr_texts = self._ocr(file_path, [page_numbers[position] for position in missing])
+        for position, text in zip(missing, ocr_texts):
+            self.cache.put(missing[position], text)
+            texts[position] = text
+        
+        return texts
+    
+    def _ocr(self, file_path: Union[str, Path], page_numbers: List[int]) -> List[str]:
+        """OCR pages, one page per worker task since each page is expensive"""
+        args = [str(file_path)] * len(page_numbers), page_numbers, [self.resolution] * len(page_numbers)
+        
+        if self.workers <= 1 or len(page_numbers) <= 1:
+            return list(map(_ocr_page, *args))
+        
+        workers = min(self.workers, len(page_numbers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker) as executor:
+            return list(executor.map(_ocr_page, *args))
+
+
+def needs_ocr(page: pdfplumber.page.Page) -> bool:
+    """Whether a page has no text layer but shows images (e.g. a scanned page)"""
+    return not page.chars and bool(page.images)
+
+
+def page_image_hash(page: pdfplumber.page.Page) -> str:
+    """
+    Hash of a page's embedded images and size
+    
+    Only the raw (still encoded) image streams are hashed, so this is cheap
+    and stable across re-uploads of the same scan.
+    
+    Args:
+        page: pdfplumber page
+    
+    Returns:
+        Hex digest identifying the page image
+    """
+    digest = hashlib.sha256(f'{page.width}x{page.height}'.encode())
+    for image in page.images:
+        digest.update(image['stream'].get_rawdata() or b'')
+    return digest.hexdigest()
+
+
+def _init_ocr_worker() -> None:
+    """Limit tesseract to one thread in pool workers, where its own threading only competes with the pool"""
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+
+def _ocr_page(file_path: str, page_number: int, resolution: int) -> str:
+    """Rasterize and OCR one page (in-process, or in a worker process)"""
+    with pdfplumber.open(file_path) as pdf:
+        image = pdf.pages[page_number - 1].to_image(resolution=resolution).original
+    
+    return pytesseract.image_to_string(image)
@@ -0,0 +1,205 @@
+"""
+OFX Parser - Streams OFX/QFX bank statements (SGML v1 and XML v2)
+"""
+
+import re
+import html
+import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional, Iterator, Tuple
+
+import pandas as pd
+
+from parsers.base_parser import BaseParser, DEFAULT_CHUNK_ROWS
+from parsers.transaction_batch import TransactionBatch
+
+
+# Number of characters read from the file per step
+READ_BLOCK_SIZE = 64 * 1024
+
+# A tag with its (optional) text value: <TRNAMT>-12.50 or </STMTTRN>
+_TOKEN = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+# Transaction fields kept from each STMTTRN aggregate
+STMTTRN_FIELDS = ['TRNTYPE', 'DTPOSTED', 'DTUSER', 'TRNAMT', 'FITID', 'NAME', 'PAYEE', 'MEMO', 'CHECKNUM']
+
+
+class OFXParser(BaseParser):
+    """Parser for OFX and QFX (Quicken) statements"""
+    
+    EXTENSIONS = ('.ofx', '.qfx')
+    
+    def __init__(self, include_raw_data: bool = True):
+        """
+        Initialize the OFX parser
+        
+        Args:
+            include_raw_data: Attach the fields of each STMTTRN aggregate to its transaction as raw_data
+        """
+        self.include_raw_data = include_raw_data
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'OFXParser':
+        return cls(include_raw_data=options.get('include_raw_data', True))
+    
+    def options(self) -> Dict[str, Any]:
+        return {'include_raw_data': self.include_raw_data}
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """OFX v1 starts with an OFXHEADER block, v2 with an <?OFX ...?> processing instruction"""
+        head = head_bytes.upper()
+        return b'OFXHEADER' in head or b'<OFX>' in head
+    
+    def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """
+        Parse an OFX/QFX bank statement file
+        
+        Args:
+            file_path: Path to the OFX/QFX file
+        
+        Returns:
+            List of standardized transaction dictionaries
+        """
+        transactions = []
+        for batch in self.iter_parse(file_path):
+            transactions.extend(batch.to_dicts())
+        return transactions
+    
+    def iter_parse(
+        self,
+        file_path: Union[str, Path],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[TransactionBatch]:
+        """
+        Stream an OFX/QFX statement as transaction batches
+        
+        OFX v1 is SGML (leaf tags are not closed) and v2 is XML, so instead of an
+        XML parser the file is tokenized tag by tag while it is read. Only the
+        current STMTTRN aggregate and one batch of rows are held in memory.
+        
+        Args:
+            file_path: Path to the OFX/QFX file
+            chunk_rows: Maximum number of transactions per batch
+        
+        Yields:
+            TransactionBatch objects in file order
+        """
+        try:
+            self.rejected_amounts = 0
+            rows = []
+            for fields in self._iter_stmttrn(file_path):
+                rows.append(fields)
+                if len(rows) >= chunk_rows:
+                    yield self._build_batch(rows)
+                    rows = []
+            
+            if rows:
+                yield self._build_batch(rows)
+        
+        except Exception as e:
+            raise ValueError(f"Failed to parse OFX file: {e}")
+    
+    def _iter_stmttrn(self, file_path: Union[str, Path]) -> Iterator[Dict[str, str]]:
+        """Yield the fields of each STMTTRN aggregate in file order"""
+        current: Optional[Dict[str, str]] = None
+        
+        for closing, tag, value in _iter_tokens(file_path):
+            tag = tag.upper()
+            
+            if tag == 'STMTTRN':
+                # SGML files may omit </STMTTRN>, so a new aggregate also ends the previous one
+                if current is not None:
+                    yield current
+                current = {} if not closing else None
+            elif tag == 'BANKTRANLIST' and closing and current is not None:
+                yield current
+                current = None
+            elif current is not None and not closing and tag in STMTTRN_FIELDS:
+                current[tag] = html.unescape(value.strip())
+        
+        if current is not None:
+            yield current
+    
+    def _build_batch(self, rows: List[Dict[str, str]]) -> TransactionBatch:
+        """Convert STMTTRN field dictionaries into a transaction batch"""
+        raw_data = None
+        if self.include_raw_data:
+            # Tags missing from a transaction are None rather than NaN
+            raw_data = pd.DataFrame(rows, columns=STMTTRN_FIELDS)
+            raw_data = raw_data.astype(object).where(raw_data.notna(), None)
+        
+        dates = [parse_ofx_date(row.get('DTPOSTED') or row.get('DTUSER')) for row in rows]
+        descriptions = [
+            row.get('NAME') or row.get('PAYEE') or row.get('MEMO') or ''
+            for row in rows
+        ]
+        amounts, rejected = self._amounts(rows)
+        
+        batch = TransactionBatch(dates, descriptions, amounts, raw_data=raw_data, rejected_amounts=rejected)
+        batch.frame['transaction_type'] = [row.get('TRNTYPE', '').lower() or None for row in rows]
+        
+        self.rejected_amounts += rejected
+        return batch
+    
+    def _amounts(self, rows: List[Dict[str, str]]) -> Tuple[List[float], int]:
+        """TRNAMT values as floats; OFX amounts are already signed"""
+        amounts = []
+        rejected = 0
+        for row in rows:
+            try:
+                # Some banks write a decimal comma
+                amounts.append(float(row.get('TRNAMT', '').replace(',', '.')))
+            except ValueError:
+                amounts.append(0.0)
+                rejected += 1
+        return amounts, rejected
+
+
+def parse_ofx_date(value: Optional[str]) -> Optional[datetime.date]:
+    """
+    Parse an OFX date such as 20240115, 20240115120000 or 20240115120000.000[-5:EST]
+    
+    Args:
+        value: OFX date string
+    
+    Returns:
+        datetime.date object, or None if the value is not a date
+    """
+    if not value or len(value) < 8:
+        return None
+    try:
+        return datetime.date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
+        return None
+
+
+def sniff_encoding(head: bytes) -> str:
+    """Pick the text encoding from an OFX v1 header or XML declaration"""
+    text = head.decode('ascii', errors='ignore').upper()
+    if 'CHARSET:1252' in text:
+        return 'cp1252'
+    if 'CHARSET:ISO-8859-1' in text or 'ENCODING="ISO-8859-1"' in text:
+        return 'latin-1'
+    return 'utf-8'
+
+
+def _iter_tokens(file_path: Union[str, Path]) -> Iterator[Tuple[str, str, str]]:
+    """Yield (closing slash, tag, text) tokens while reading the file block by block"""
+    with open(file_path, 'rb') as f:
+        encoding = sniff_encoding(f.read(1024))
+    
+    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+        pending = ''
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            text = pending + block
+            
+            # Keep the last (possibly incomplete) token for the next block
+            cut = text.rfind('<') if block else len(text)
+            for match in _TOKEN.finditer(text, 0, cut):
+                yield match.groups()
+            
+            if not block:
+                break
+            pending = text[cut:] if cut >= 0 else ''
@@ -0,0 +1,175 @@
+"""
+Parse Cache - Persistent, content-addressed cache of parsed statements
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import List, Dict, Any, Union, Optional
+
+import pandas as pd
+
+from parsers.base_parser import BaseParser
+from utils.file_utils import atomic_write, evict_least_recently_used
+
+# Parquet needs pyarrow; fall back to pickle files when it is not installed
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+# Default location and size budget of the on-disk cache
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'fintech_parse_cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Block size used when hashing statement files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ParseCache:
+    """On-disk cache of parsed transactions keyed by file content, parser version and parser options"""
+    
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the parse cache
+        
+        Args:
+            cache_dir: Directory that holds the cached statements
+            max_bytes: Total size budget; least recently used entries are evicted beyond it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.extension = '.parquet' if PARQUET_AVAILABLE else '.pkl'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def parse(self, file_path: Union[str, Path], parser: BaseParser) -> List[Dict[str, Any]]:
+        """
+        Return the parsed transactions of a file, parsing it only on a cache miss
+        
+        Args:
+            file_path: Path to the bank statement file
+            parser: Parser to use when the file is not cached yet
+        
+        Returns:
+            List of standardized transaction dictionaries
+        """
+        key = self.key_for(file_path, parser)
+        
+        transactions = self.get(key)
+        if transactions is None:
+            transactions = parser.parse(file_path)
+            self.put(key, transactions)
+        
+        return transactions
+    
+    def key_for(self, file_path: Union[str, Path], parser: BaseParser) -> str:
+        """
+        Compute the cache key of a file for a given parser
+        
+        Args:
+            file_path: Path to the bank statement file
+            parser: Parser that would parse the file
+        
+        Returns:
+            Hex digest of the file contents, parser class, parser version and parser options
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        
+        digest.update(f'{type(parser).__name__}:{parser.PARSER_VERSION}:'.encode())
+        
+        # Results parsed with other settings (e.g. without raw_data) must not be served
+        digest.update(json.dumps(parser.options(), sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load cached transactions
+        
+        Args:
+            key: Cache key from key_for
+        
+        Returns:
+            List of transaction dictionaries, or None on a cache miss
+        """
+        path = self._path(key)
+        
+        try:
+            if PARQUET_AVAILABLE:
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_pickle(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        
+        # Mark the entry as recently used for LRU eviction
+        os.utime(path)
+        
+        return self._from_frame(df)
+    
+    def put(self, key: str, transactions: List[Dict[str, Any]]) -> None:
+        """
+        Store parsed transactions and evict old entries if over the size budget
+        
+        Args:
+            key: Cache key from key_for
+            transactions: List of transaction dictionaries
+        """
+        path = self._path(key)
+        df = self._to_frame(transactions)
+        
+        try:
+            with atomic_write(path, 'wb') as f:
+                if PARQUET_AVAILABLE:
+                    df.to_parquet(f, index=False)
+                else:
+                    df.to_pickle(f)
+        except Exception as e:
+            print(f"Warning: Failed to write parse cache entry: {e}")
+            return
+        
+        evict_least_recently_used(self.cache_dir, f'*{self.extension}', self.max_bytes)
+    
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        for path in self.cache_dir.glob(f'*{self.extension}'):
+            path.unlink(missing_ok=True)
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}{self.extension}'
+    
+    def _to_frame(self, transactions: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Convert transactions to a DataFrame, storing raw_data as JSON text"""
+        df = pd.DataFrame([
+            {key: value for key, value in t.items() if key != 'raw_data'}
+            for t in transactions
+        ])
+        
+        if any('raw_data' in t for t in transactions):
+            df['raw_data'] = [json.dumps(t.get('raw_data'), default=_json_default) for t in transactions]
+        
+        return df
+    
+    def _from_frame(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a cached DataFrame back to transaction dictionaries"""
+        transactions = df.to_dict('records')
+        
+        for t in transactions:
+            if 'raw_data' in t:
+                t['raw_data'] = json.loads(t['raw_data']) if t['raw_data'] is not None else None
+        
+        return transactions
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize lazy raw rows as plain dictionaries and anything else as text"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
@@ -1,44 +1,140 @@
 """
-Parser Factory - Creates appropriate parser based on file type
+Parser Factory - Creates appropriate parser based on file content and type
 """
 
 from pathlib import Path
-from typing import Union
+from typing import List, Type, Union
 
 from parsers.base_parser import BaseParser
 from parsers.csv_parser import CSVParser
 from parsers.pdf_parser import PDFParser
 from parsers.excel_parser import ExcelParser
+from parsers.ofx_parser import OFXParser
+from parsers.camt_parser import CAMTParser
+
+
+# Number of leading bytes read to sniff a file's format
+HEAD_BYTES = 4096
+
+# Registered parser classes, probed in order
+PARSER_REGISTRY: List[Type[BaseParser]] = []
+
+
+def register_parser(parser_class: Type[BaseParser], first: bool = True) -> Type[BaseParser]:
+    """
+    Add a parser class to the registry
+    
+    Can be used as a class decorator. Parsers registered later are probed
+    first by default, so a specific format (e.g. one bank's CSV layout) wins
+    over the generic built-in parsers.
+    
+    Args:
+        parser_class: BaseParser subclass declaring EXTENSIONS and MAGIC or can_parse
+        first: Probe the parser before the already registered ones
+    
+    Returns:
+        The registered parser class
+    """
+    if parser_class in PARSER_REGISTRY:
+        PARSER_REGISTRY.remove(parser_class)
+    
+    if first:
+        PARSER_REGISTRY.insert(0, parser_class)
+    else:
+        PARSER_REGISTRY.append(parser_class)
+    
+    return parser_class
+
+
+def supported_extensions() -> List[str]:
+    """File extensions handled by the registered parsers"""
+    return list(dict.fromkeys(ext for parser_class in PARSER_REGISTRY for ext in parser_class.EXTENSIONS))
 
 
 class ParserFactory:
-    """Factory class to create appropriate parser based on file extension"""
+    """Factory class to create appropriate parser by sniffing the file content"""
+    
+    def __init__(self, lazy_raw_data: bool = False, include_raw_data: bool = True, pdf_workers: int = 1):
+        """
+        Initialize the parser factory
+        
+        Args:
+            lazy_raw_data: Create table parsers that keep raw_data as lazy row references
+            include_raw_data: Create table parsers that attach raw_data at all; without
+                              it they only read the date, description and amount columns
+            pdf_workers: Worker processes per PDF parse (1 extracts in-process)
+        """
+        self.lazy_raw_data = lazy_raw_data
+        self.include_raw_data = include_raw_data
+        self.pdf_workers = pdf_workers
     
     def get_parser(self, file_path: Union[str, Path]) -> BaseParser:
         """
         Returns the appropriate parser for the given file
         
+        Only the first HEAD_BYTES of the file are read. Each registered parser's
+        can_parse probe is tried in order; if none recognises the content, the
+        parser is chosen by file extension.
+        
         Args:
             file_path: Path to the bank statement file
-            
+        
         Returns:
             An instance of the appropriate parser
-            
+        
         Raises:
-            ValueError: If file extension is not supported
+            ValueError: If file format is not supported
         """
         if isinstance(file_path, str):
             file_path = Path(file_path)
-            
-        # Get file extension
+        
+        return self._create(self.get_parser_class(file_path))
+    
+    def get_parser_class(self, file_path: Union[str, Path]) -> Type[BaseParser]:
+        """
+        Pick the parser class for a file without instantiating it
+        
+        Args:
+            file_path: Path to the bank statement file
+        
+        Returns:
+            Registered parser class
+        
+        Raises:
+            ValueError: If file format is not supported
+        """
+        file_path = Path(file_path)
+        
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(HEAD_BYTES)
+        except OSError:
+            head = b''
+        
+        # Sniff the content first, so mislabelled files still reach the right parser
+        if head:
+            for parser_class in PARSER_REGISTRY:
+                if parser_class.can_parse(head):
+                    return parser_class
+        
+        # Fall back to the file extension
         ext = file_path.suffix.lower()
+        for parser_class in PARSER_REGISTRY:
+            if ext in parser_class.EXTENSIONS:
+                return parser_class
         
-        # Create appropriate parser
-        if ext == '.csv':
-            return CSVParser()
-        elif ext == '.pdf':
-            return PDFParser()
-        elif ext in ['.xlsx', '.xls']:
-            return ExcelParser()
-        else:
-            raise ValueError(f"Unsupported file format: {ext}. Supported formats: .csv, .pdf, .xlsx, .xls")
+        raise ValueError(
+            f"Unsupported file format: {ext}. Supported formats: {', '.join(supported_extensions())}"
+        )
+    
+    def _create(self, parser_class: Type[BaseParser]) -> BaseParser:
+        return parser_class.create(
+            lazy_raw_data=self.lazy_raw_data,
+            include_raw_data=self.include_raw_data,
+            pdf_workers=self.pdf_workers
+        )
+
+
+# Built-in parsers, from the most specific probe to the generic CSV text probe
+for _parser_class in (PDFParser, ExcelParser, OFXParser, CAMTParser, CSVParser):
+    register_parser(_parser_class, first=False)
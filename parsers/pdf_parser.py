@@ -2,22 +2,83 @@
 PDF Parser - Parser for PDF bank statements
 """
 
-import re
-import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional, Callable, Tuple
 
 import pdfplumber
 import tabula
 import pandas as pd
 
 from parsers.base_parser import BaseParser
+from parsers.amounts import normalize_amounts, combine_debit_credit
+from parsers.schema_inference import SchemaInferer, find_column_index, DEBIT_NAMES, CREDIT_NAMES
+from parsers.pdf_patterns import BankProfile, detect_bank_profile, get_bank_profile
+from parsers.ocr import PageOCR, OCR_AVAILABLE, needs_ocr
 from utils.date_utils import parse_date
 
 
+# Number of consecutive pages handed to a worker at a time
+DEFAULT_PAGES_PER_TASK = 8
+
+# Number of leading pages inspected when choosing an extraction strategy
+PROBE_PAGES = 3
+
+# Extraction strategies chosen by the probe
+STRATEGY_TABLES = 'tables'    # Ruled tables, extracted with tabula
+STRATEGY_TEXT = 'text'        # Text lines, extracted with pdfplumber
+STRATEGY_SCANNED = 'scanned'  # Page images without a text layer
+
+# PDF tables are matched on header names only; other tables on a page are usually summaries.
+# Withdrawal/deposit columns are left to the debit/credit split, which gets their signs right.
+PDF_TABLE_INFERER = SchemaInferer(
+    date_names=['date', 'transaction date', 'posted'],
+    amount_names=['amount', 'transaction amount'],
+    infer_from_content=False
+)
+
+
 class PDFParser(BaseParser):
     """Parser for PDF bank statements"""
     
+    EXTENSIONS = ('.pdf',)
+    MAGIC = (b'%PDF-',)
+    
+    @classmethod
+    def can_parse(cls, head_bytes: bytes) -> bool:
+        """PDF readers accept junk before the header, so look for it in the first KB"""
+        return b'%PDF-' in head_bytes[:1024]
+    
+    @classmethod
+    def create(cls, **options: Any) -> 'PDFParser':
+        """Instantiate the parser from factory options (pdf_workers)"""
+        return cls(workers=options.get('pdf_workers', 1))
+    
+    def __init__(
+        self,
+        workers: int = 1,
+        pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+        ocr: Optional[PageOCR] = None
+    ):
+        """
+        Initialize the PDF parser
+        
+        Args:
+            workers: Number of worker processes for page extraction
+                     (1 extracts in-process; more opts in to a process pool)
+            pages_per_task: Number of consecutive pages extracted per worker task
+            ocr: OCR stage for scanned statements (None creates one with the
+                 same number of workers and the default OCR cache)
+        """
+        self.workers = max(1, workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.ocr = ocr
+        
+        # Strategy and per-step timings (seconds) of the last parse() call
+        self.strategy = None
+        self.timings: Dict[str, float] = {}
+    
     def parse(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """
         Parse a PDF bank statement file
@@ -29,12 +90,27 @@ class PDFParser(BaseParser):
             List of standardized transaction dictionaries
         """
         try:
-            # First try tabula-py to extract tables
-            transactions = self._parse_with_tabula(file_path)
+            self.timings = {}
+            self.rejected_amounts = 0
             
-            # If tabula didn't find transactions, try pdfplumber
-            if not transactions:
-                transactions = self._parse_with_pdfplumber(file_path)
+            # Classify the document from its first pages so only one extractor runs
+            self.strategy = self._timed('probe', self._probe_strategy, file_path)
+            
+            if self.strategy == STRATEGY_SCANNED:
+                if not OCR_AVAILABLE:
+                    raise ValueError("PDF has no text layer (scanned statement) and pytesseract is not installed")
+                transactions = self._timed('ocr', self._parse_with_ocr, file_path)
+            elif self.strategy == STRATEGY_TABLES:
+                transactions = self._timed('tabula', self._parse_with_tabula, file_path)
+                
+                # pdfplumber also reads tables, so it is still a fallback if tabula finds nothing
+                if not transactions:
+                    transactions = self._timed('pdfplumber', self._parse_with_pdfplumber, file_path)
+                else:
+                    # tabula cannot read pages without a text layer (e.g. scanned pages in a mixed document)
+                    transactions += self._timed('ocr', self._parse_scanned_pages, file_path)
+            else:
+                transactions = self._timed('pdfplumber', self._parse_with_pdfplumber, file_path)
                 
             if not transactions:
                 raise ValueError("Could not extract transactions from PDF")
@@ -44,11 +120,56 @@ class PDFParser(BaseParser):
         except Exception as e:
             raise ValueError(f"Failed to parse PDF file: {e}")
     
+    def _probe_strategy(self, file_path: Union[str, Path]) -> str:
+        """
+        Classify a PDF from its first pages
+        
+        Args:
+            file_path: Path to the PDF file
+        
+        Returns:
+            STRATEGY_TABLES for ruled tables, STRATEGY_SCANNED for image-only
+            pages, STRATEGY_TEXT otherwise
+        """
+        char_count = 0
+        image_count = 0
+        table_count = 0
+        
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages[:PROBE_PAGES]:
+                char_count += len(page.chars)
+                image_count += len(page.images)
+                
+                # Only look for ruled tables when the page has drawn lines or boxes
+                if page.lines or page.rects:
+                    table_count += len(page.find_tables())
+        
+        if char_count == 0 and image_count > 0:
+            return STRATEGY_SCANNED
+        if table_count > 0:
+            return STRATEGY_TABLES
+        return STRATEGY_TEXT
+    
+    def _timed(self, name: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a step and record its wall time in self.timings, excluding steps timed inside it"""
+        start = time.perf_counter()
+        recorded = sum(self.timings.values())
+        try:
+            return func(*args)
+        finally:
+            # Nested steps (e.g. OCR of scanned pages during pdfplumber) are only counted under their own name
+            nested = sum(self.timings.values()) - recorded
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start - nested
+    
     def _parse_with_tabula(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """Parse PDF using tabula-py (good for structured tables)"""
         try:
-            # Extract all tables from the PDF
-            tables = tabula.read_pdf(str(file_path), pages='all', multiple_tables=True)
+            # Extract tables page range by page range, keeping page order
+            tables = [
+                table
+                for range_tables in self._map_page_ranges(_read_tabula_tables, file_path)
+                for table in range_tables
+            ]
             
             if not tables:
                 return []
@@ -60,19 +181,24 @@ class PDFParser(BaseParser):
                 if df.empty:
                     continue
                     
-                # Try to identify the columns based on common naming patterns
-                date_col = self._find_column(df, ['date', 'transaction date', 'posted'])
-                desc_col = self._find_column(df, ['description', 'payee', 'merchant', 'transaction'])
-                amount_col = self._find_column(df, ['amount', 'transaction amount', 'withdrawal', 'deposit'])
+                # Identify the columns from the table header
+                schema = PDF_TABLE_INFERER.infer(df)
                 
                 # If we couldn't find the essential columns, try the next table
-                if not all([date_col, desc_col, amount_col]):
+                if schema is None:
                     continue
                 
+                date_col, desc_col = schema.date, schema.description
+                
+                # Normalize the whole amount column (or debit/credit pair) at once
+                amounts, rejected = self._amount_column(df, schema)
+                amounts = amounts.tolist()
+                self.rejected_amounts += rejected
+                
                 # Process transactions
-                for _, row in df.iterrows():
+                for row_offset, (_, row) in enumerate(df.iterrows()):
                     # Skip header rows or empty rows
-                    if self._is_header_row(row):
+                    if self._is_header_row(row.values):
                         continue
                         
                     # Parse date
@@ -87,7 +213,7 @@ class PDFParser(BaseParser):
                     description = str(row[desc_col]).strip()
                     
                     # Parse amount
-                    amount = self._parse_amount(row[amount_col])
+                    amount = amounts[row_offset]
                     
                     # Create standardized transaction
                     transaction = {
@@ -107,159 +233,305 @@ class PDFParser(BaseParser):
     
     def _parse_with_pdfplumber(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
         """Parse PDF using pdfplumber (good for text extraction)"""
-        transactions = []
+        profile, statement_year = self._detect_profile(file_path)
+        
+        # Pages are extracted in parallel; results come back in page order
+        page_results = self._map_page_ranges(_parse_pdfplumber_pages, file_path, profile.name, statement_year)
         
+        # Pages without a text layer come back as None; read them with OCR instead
+        scanned = [page_number for page_number, result in enumerate(page_results, 1) if result is None]
+        if scanned:
+            ocr_results = self._timed('ocr', self._parse_ocr_pages, file_path, scanned, profile, statement_year)
+            for page_number, page_transactions in zip(scanned, ocr_results):
+                page_results[page_number - 1] = page_transactions
+        
+        return self._normalize_amounts([transaction for page_transactions in page_results for transaction in page_transactions])
+    
+    def _parse_scanned_pages(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Parse only the pages without a text layer, with OCR"""
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                
-                if not text:
+            scanned = [page.page_number for page in pdf.pages if needs_ocr(page)]
+        
+        if not scanned:
+            return []
+        
+        profile, statement_year = self._detect_profile(file_path)
+        page_results = self._parse_ocr_pages(file_path, scanned, profile, statement_year)
+        return self._normalize_amounts([transaction for page_transactions in page_results for transaction in page_transactions])
+    
+    def _parse_ocr_pages(
+        self,
+        file_path: Union[str, Path],
+        page_numbers: List[int],
+        profile: BankProfile,
+        statement_year: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        OCR pages without a text layer and extract their transactions
+        
+        Args:
+            file_path: Path to the PDF file
+            page_numbers: 1-based numbers of the pages to OCR
+            profile: Bank profile detected from the text pages
+            statement_year: Year completing dates printed without one
+        
+        Returns:
+            One list of transactions per page, aligned with page_numbers
+            (empty lists if pytesseract is not installed)
+        """
+        if not OCR_AVAILABLE:
+            print(f"Warning: Skipping {len(page_numbers)} PDF pages without a text layer (pytesseract is not installed)")
+            return [[] for _ in page_numbers]
+        
+        if self.ocr is None:
+            self.ocr = PageOCR(workers=self.workers)
+        
+        return [
+            self._parse_text_lines(text, profile, statement_year)
+            for text in self.ocr.ocr_pages(file_path, page_numbers)
+        ]
+    
+    def _detect_profile(self, file_path: Union[str, Path]) -> Tuple[BankProfile, Optional[str]]:
+        """Detect the bank layout and statement year from the first page"""
+        with pdfplumber.open(file_path) as pdf:
+            first_page_text = pdf.pages[0].extract_text() if pdf.pages else None
+        
+        profile = detect_bank_profile(first_page_text)
+        return profile, profile.find_year(first_page_text or '')
+    
+    def _parse_with_ocr(self, file_path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Parse a scanned PDF from OCR text (only image-only pages are OCRed)"""
+        if self.ocr is None:
+            self.ocr = PageOCR(workers=self.workers)
+        
+        texts = self.ocr.extract_texts(file_path)
+        
+        profile = detect_bank_profile(texts[0] if texts else None)
+        statement_year = profile.find_year(texts[0] if texts else '')
+        
+        transactions = []
+        for text in texts:
+            transactions.extend(self._parse_text_lines(text, profile, statement_year))
+        
+        return self._normalize_amounts(transactions)
+    
+    def _parse_pdfplumber_page(
+        self,
+        page: Any,
+        profile: BankProfile,
+        statement_year: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract transactions from a single pdfplumber page using a bank profile
+        
+        Amounts are left as raw text (a (debit, credit) pair for tables with
+        separate columns) for _normalize_amounts.
+        
+        Returns:
+            List of transactions, or None if the page has no text layer and needs OCR
+        """
+        if needs_ocr(page):
+            return None
+        
+        text = page.extract_text()
+        
+        if not text:
+            return []
+        
+        transactions = self._parse_text_lines(text, profile, statement_year)
+        
+        # If we found transactions with regex, skip the table pass for this page
+        if transactions:
+            return transactions
+            
+        # If regex didn't work, try to extract tables
+        tables = page.extract_tables()
+        
+        for table in tables:
+            # Skip empty tables
+            if not table or len(table) <= 1:  # Skip tables with only headers
+                continue
+            
+            # Assume first row is header
+            headers = table[0]
+            
+            # Find date, description, and amount columns
+            date_idx = find_column_index(headers, PDF_TABLE_INFERER.date_names)
+            desc_idx = find_column_index(headers, PDF_TABLE_INFERER.description_names)
+            amount_idx = find_column_index(headers, PDF_TABLE_INFERER.amount_names)
+            
+            # Without an amount column, look for separate debit and credit columns
+            debit_idx = credit_idx = None
+            if amount_idx is None:
+                debit_idx = find_column_index(headers, DEBIT_NAMES)
+                credit_idx = find_column_index(headers, CREDIT_NAMES)
+                if debit_idx is None or credit_idx is None or debit_idx == credit_idx:
+                    continue
+            
+            # If we couldn't find the essential columns, try the next table
+            if date_idx is None or desc_idx is None:
+                continue
+            
+            used_idx = [idx for idx in (date_idx, desc_idx, amount_idx, debit_idx, credit_idx) if idx is not None]
+            
+            # Process transactions
+            for row in table[1:]:  # Skip header row
+                # Skip empty rows
+                if not row or len(row) <= max(used_idx):
                     continue
                 
-                # Try to extract transactions using regex patterns
-                # This is a simplified approach and may need to be customized for specific bank formats
+                # Parse date
+                date_str = str(row[date_idx])
+                date = parse_date(date_str)
                 
-                # Common patterns for transaction lines
-                # Format: Date Description Amount
-                transaction_patterns = [
-                    # Pattern 1: MM/DD/YYYY or DD/MM/YYYY followed by description and amount
-                    r'(\d{1,2}/\d{1,2}/\d{2,4})\s+([A-Za-z0-9\s\-\.,&\'\"]+?)\s+([\-\$\d\.,]+)',
-                    
-                    # Pattern 2: YYYY-MM-DD followed by description and amount
-                    r'(\d{4}-\d{2}-\d{2})\s+([A-Za-z0-9\s\-\.,&\'\"]+?)\s+([\-\$\d\.,]+)',
-                ]
+                # Skip if date parsing failed
+                if not date:
+                    continue
                 
-                for pattern in transaction_patterns:
-                    matches = re.finditer(pattern, text)
-                    
-                    for match in matches:
-                        date_str, description, amount_str = match.groups()
-                        
-                        # Parse date
-                        date = parse_date(date_str)
-                        
-                        # Skip if date parsing failed
-                        if not date:
-                            continue
-                        
-                        # Parse description
-                        description = description.strip()
-                        
-                        # Parse amount
-                        amount = self._parse_amount(amount_str)
-                        
-                        # Create standardized transaction
-                        transaction = {
-                            'date': date,
-                            'description': description,
-                            'amount': amount,
-                            'raw_data': {'text': match.group(0)}  # Store original text for reference
-                        }
-                        
-                        transactions.append(transaction)
+                # Parse description
+                description = str(row[desc_idx]).strip()
                 
-                # If we found transactions with regex, return them
-                if transactions:
-                    return transactions
-                    
-                # If regex didn't work, try to extract tables
-                tables = page.extract_tables()
+                # Keep the raw amount; debit/credit pairs are signed when normalized
+                if amount_idx is not None:
+                    amount = row[amount_idx]
+                else:
+                    amount = (row[debit_idx], row[credit_idx])
                 
-                for table in tables:
-                    # Skip empty tables
-                    if not table or len(table) <= 1:  # Skip tables with only headers
-                        continue
-                    
-                    # Assume first row is header
-                    headers = table[0]
-                    
-                    # Find date, description, and amount columns
-                    date_idx = self._find_header_index(headers, ['date', 'transaction date', 'posted'])
-                    desc_idx = self._find_header_index(headers, ['description', 'payee', 'merchant', 'transaction'])
-                    amount_idx = self._find_header_index(headers, ['amount', 'transaction amount', 'withdrawal', 'deposit'])
-                    
-                    # If we couldn't find the essential columns, try the next table
-                    if not all([date_idx is not None, desc_idx is not None, amount_idx is not None]):
-                        continue
-                    
-                    # Process transactions
-                    for row in table[1:]:  # Skip header row
-                        # Skip empty rows
-                        if not row or len(row) <= max(date_idx, desc_idx, amount_idx):
-                            continue
-                        
-                        # Parse date
-                        date_str = str(row[date_idx])
-                        date = parse_date(date_str)
-                        
-                        # Skip if date parsing failed
-                        if not date:
-                            continue
-                        
-                        # Parse description
-                        description = str(row[desc_idx]).strip()
-                        
-                        # Parse amount
-                        amount = self._parse_amount(row[amount_idx])
-                        
-                        # Create standardized transaction
-                        transaction = {
-                            'date': date,
-                            'description': description,
-                            'amount': amount,
-                            'raw_data': dict(zip(headers, row))  # Store original data for reference
-                        }
-                        
-                        transactions.append(transaction)
+                # Create standardized transaction
+                transaction = {
+                    'date': date,
+                    'description': description,
+                    'amount': amount,
+                    'raw_data': dict(zip(headers, row))  # Store original data for reference
+                }
+                
+                transactions.append(transaction)
         
         return transactions
     
-    def _find_column(self, df: pd.DataFrame, possible_names: List[str]) -> Union[str, None]:
-        """Find a column in the DataFrame based on possible names"""
-        for name in possible_names:
-            for col in df.columns:
-                if isinstance(col, str) and name.lower() in col.lower():
-                    return col
-        return None
-    
-    def _find_header_index(self, headers: List[str], possible_names: List[str]) -> Union[int, None]:
-        """Find a header index based on possible names"""
-        for name in possible_names:
-            for i, header in enumerate(headers):
-                if isinstance(header, str) and name.lower() in header.lower():
-                    return i
-        return None
+    def _parse_text_lines(
+        self,
+        text: str,
+        profile: BankProfile,
+        statement_year: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract transactions from page text using a bank profile's line patterns (amounts stay raw text)"""
+        transactions = []
+        
+        # Scan the page once with the bank profile's precompiled line patterns
+        for line in profile.iter_lines(text):
+            date_str = line['date']
+            
+            # Complete dates printed without a year (e.g. 01/15) from the statement header
+            if statement_year and date_str.count('/') == 1:
+                date_str = f"{date_str}/{statement_year}"
+            
+            # Parse date
+            date = parse_date(date_str)
+            
+            # Skip if date parsing failed
+            if not date:
+                continue
+            
+            # Parse description
+            description = line['description'].strip()
+            
+            # Create standardized transaction
+            transaction = {
+                'date': date,
+                'description': description,
+                'amount': line['amount'],
+                'raw_data': {'text': line['text']}  # Store original text for reference
+            }
+            
+            transactions.append(transaction)
+        
+        return transactions
     
-    def _is_header_row(self, row: pd.Series) -> bool:
-        """Check if a row is likely a header row"""
-        # Convert all values to string and lowercase
-        values = [str(v).lower() for v in row.values]
+    def _normalize_amounts(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Replace the raw amounts of extracted transactions with signed floats in one vectorized pass
+        
+        Args:
+            transactions: Transactions whose amount is raw text, or a (debit, credit) pair
+        
+        Returns:
+            The same transactions, with float amounts
+        """
+        split = pd.Series([isinstance(t['amount'], tuple) for t in transactions], dtype=bool)
+        single = pd.Series([None if is_split else t['amount'] for t, is_split in zip(transactions, split)], dtype=object)
+        debit = pd.Series([t['amount'][0] if is_split else None for t, is_split in zip(transactions, split)], dtype=object)
+        credit = pd.Series([t['amount'][1] if is_split else None for t, is_split in zip(transactions, split)], dtype=object)
         
-        # Check for common header terms
-        header_terms = ['date', 'description', 'amount', 'balance', 'transaction']
-        matches = sum(1 for term in header_terms if any(term in v for v in values))
+        amounts, rejected = normalize_amounts(single)
+        split_amounts, split_rejected = combine_debit_credit(debit, credit)
+        self.rejected_amounts += rejected + split_rejected
         
-        # If multiple header terms are found, it's likely a header row
-        return matches >= 2
+        for transaction, amount in zip(transactions, split_amounts.where(split, amounts).tolist()):
+            transaction['amount'] = amount
+        return transactions
     
-    def _parse_amount(self, amount_value: Any) -> float:
-        """Parse amount value to float"""
-        if isinstance(amount_value, (int, float)):
-            return float(amount_value)
-        
-        # Handle string amounts
-        if isinstance(amount_value, str):
-            # Remove currency symbols and commas
-            clean_amount = amount_value.replace('$', '').replace(',', '').strip()
-            
-            # Handle parentheses for negative values: (123.45) -> -123.45
-            if clean_amount.startswith('(') and clean_amount.endswith(')'):
-                clean_amount = '-' + clean_amount[1:-1]
-                
-            try:
-                return float(clean_amount)
-            except ValueError:
-                pass
+    def _map_page_ranges(
+        self,
+        func: Callable[..., List[Any]],
+        file_path: Union[str, Path],
+        *args: Any
+    ) -> List[Any]:
+        """
+        Apply a page-range extraction function over the whole document
         
-        # Default fallback
-        return 0.0
+        Args:
+            func: Module-level function taking (file_path, first_page, last_page, *args)
+                  with 1-based inclusive page numbers and returning a list of results
+            file_path: Path to the PDF file
+            *args: Extra picklable arguments passed to every call
+        
+        Returns:
+            Concatenated results of all page ranges in page order
+        """
+        with pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+        
+        ranges = [
+            (start, min(start + self.pages_per_task - 1, page_count))
+            for start in range(1, page_count + 1, self.pages_per_task)
+        ]
+        
+        if self.workers <= 1 or len(ranges) <= 1:
+            range_results = [func(str(file_path), start, end, *args) for start, end in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as executor:
+                # map() yields results in submission order, keeping the output deterministic
+                range_results = list(executor.map(
+                    func,
+                    [str(file_path)] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    *[[arg] * len(ranges) for arg in args]
+                ))
+        
+        return [result for results in range_results for result in results]
+
+
+def _read_tabula_tables(file_path: str, first_page: int, last_page: int) -> List[List[pd.DataFrame]]:
+    """Read the tables of a page range with tabula (runs in a worker process)"""
+    # One call per range: without jpype every tabula call starts a new JVM
+    return [tabula.read_pdf(file_path, pages=f'{first_page}-{last_page}', multiple_tables=True) or []]
+
+
+def _parse_pdfplumber_pages(
+    file_path: str,
+    first_page: int,
+    last_page: int,
+    profile_name: str = 'generic',
+    statement_year: Optional[str] = None
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """Extract transactions from a page range with pdfplumber (runs in a worker process; None marks pages needing OCR)"""
+    parser = PDFParser(workers=1)
+    profile = get_bank_profile(profile_name)
+    
+    with pdfplumber.open(file_path) as pdf:
+        return [
+            parser._parse_pdfplumber_page(pdf.pages[page_number - 1], profile, statement_year)
+            for page_number in range(first_page, last_page + 1)
+        ]
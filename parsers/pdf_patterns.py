@@ -0,0 +1,152 @@
+"""
+PDF Patterns - Registry of precompiled transaction-line patterns for PDF statements
+"""
+
+import re
+from typing import List, Dict, Any, Optional, Pattern, Iterator
+
+
+# Building blocks shared by the line patterns
+_DESCRIPTION = r"(?P<description>[A-Za-z0-9][^\n]*?)"
+_AMOUNT = r"(?P<amount>\(?-?\$?[\d,]*\.?\d+\)?-?(?:[ \t]*(?:CR|DR)\.?)?)"  # Keeps a CR/DR marker for normalization
+_BALANCE = r"(?:[ \t]+\(?-?\$?[\d,]+\.\d{2}\)?-?)?"  # Optional running balance column
+
+# Generic layouts understood for every bank
+GENERIC_PATTERNS = [
+    # MM/DD/YYYY or DD/MM/YYYY followed by description and amount
+    r"(?P<date>\d{1,2}/\d{1,2}/\d{2,4})[ \t]+" + _DESCRIPTION + r"[ \t]+" + _AMOUNT + _BALANCE,
+    
+    # YYYY-MM-DD followed by description and amount
+    r"(?P<date>\d{4}-\d{2}-\d{2})[ \t]+" + _DESCRIPTION + r"[ \t]+" + _AMOUNT + _BALANCE,
+]
+
+
+class BankProfile:
+    """Transaction-line layout of one bank's PDF statements"""
+    
+    def __init__(
+        self,
+        name: str,
+        detect: Optional[str],
+        line_patterns: List[str],
+        year_pattern: Optional[str] = None
+    ):
+        """
+        Initialize and compile a bank profile
+        
+        Args:
+            name: Profile name
+            detect: Regex matched against the first page to recognise the bank (None never matches)
+            line_patterns: Transaction-line regexes with date, description and amount named groups;
+                           the generic patterns are appended after them
+            year_pattern: Optional regex with a year group used to complete dates printed without a year
+        """
+        self.name = name
+        self.detect = re.compile(detect, re.IGNORECASE) if detect else None
+        self.year_pattern = re.compile(year_pattern, re.IGNORECASE) if year_pattern else None
+        
+        # Combine all line patterns into one alternation so each page is scanned once.
+        # Group names must be unique, so every alternative gets its own prefix.
+        parts = []
+        for i, pattern in enumerate(line_patterns + GENERIC_PATTERNS):
+            prefix = f'p{i}'
+            parts.append(f'(?P<{prefix}>' + re.sub(r'\(\?P<(\w+)>', rf'(?P<{prefix}_\1>', pattern) + ')')
+        
+        # Lines may end with a currency code (or a CR/DR marker after a balance)
+        self.regex: Pattern = re.compile(
+            r'^[ \t]*(?:' + '|'.join(parts) + r')(?:[ \t]*(?:CR|DR|[A-Z]{3})\.?)?[ \t]*$',
+            re.MULTILINE
+        )
+    
+    def find_year(self, text: str) -> Optional[str]:
+        """Return the statement year printed on a page, if the profile knows where to find it"""
+        if not self.year_pattern:
+            return None
+        match = self.year_pattern.search(text)
+        return match.group('year') if match else None
+    
+    def iter_lines(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        Scan page text once and yield the matched transaction lines
+        
+        Args:
+            text: Extracted page text
+        
+        Yields:
+            Dictionaries with date, description, amount and text (the full matched line)
+        """
+        for match in self.regex.finditer(text):
+            prefix = match.lastgroup
+            yield {
+                'date': match.group(f'{prefix}_date'),
+                'description': match.group(f'{prefix}_description'),
+                'amount': match.group(f'{prefix}_amount'),
+                'text': match.group(0).strip()
+            }
+
+
+# Registry of known bank profiles, in detection order
+BANK_PROFILES: Dict[str, BankProfile] = {}
+
+
+def register_bank_profile(profile: BankProfile) -> BankProfile:
+    """
+    Add a bank profile to the registry
+    
+    Args:
+        profile: Compiled bank profile
+    
+    Returns:
+        The registered profile
+    """
+    BANK_PROFILES[profile.name] = profile
+    return profile
+
+
+def detect_bank_profile(first_page_text: Optional[str]) -> BankProfile:
+    """
+    Pick the bank profile matching the first page of a statement
+    
+    Args:
+        first_page_text: Extracted text of the first page
+    
+    Returns:
+        The first matching profile, or the generic profile
+    """
+    if first_page_text:
+        for profile in BANK_PROFILES.values():
+            if profile.detect and profile.detect.search(first_page_text):
+                return profile
+    return BANK_PROFILES['generic']
+
+
+def get_bank_profile(name: str) -> BankProfile:
+    """Return a registered bank profile by name"""
+    return BANK_PROFILES[name]
+
+
+# Chase: "01/15 DESCRIPTION 45.67" with the year taken from the statement period
+register_bank_profile(BankProfile(
+    'chase',
+    r'JPMorgan\s+Chase|chase\.com|\bCHASE\b',
+    [r"(?P<date>\d{2}/\d{2})[ \t]+" + _DESCRIPTION + r"[ \t]+" + _AMOUNT + _BALANCE],
+    year_pattern=r'\d{2}/\d{2}/(?P<year>\d{4})\s+(?:through|to|-)\s+\d{2}/\d{2}/\d{4}'
+))
+
+# Bank of America: "01/15/24 DESCRIPTION -45.67"
+register_bank_profile(BankProfile(
+    'boa',
+    r'Bank\s+of\s+America|bankofamerica\.com',
+    [r"(?P<date>\d{2}/\d{2}/\d{2})[ \t]+" + _DESCRIPTION + r"[ \t]+" + _AMOUNT]
+))
+
+# Wells Fargo: "1/15 DESCRIPTION 45.67 1,234.56" with the year taken from the statement header
+register_bank_profile(BankProfile(
+    'wells',
+    r'Wells\s+Fargo|wellsfargo\.com',
+    [r"(?P<date>\d{1,2}/\d{1,2})[ \t]+" + _DESCRIPTION + r"[ \t]+" + _AMOUNT + _BALANCE],
+    year_pattern=r'(?:statement\s+period|ending\s+balance\s+on|through)\s+[A-Za-z]*\s*\d{1,2}[,/]?\s*\d{0,2}[,/]?\s*(?P<year>\d{4})'
+))
+
+# Fallback used when no bank is recognised
+register_bank_profile(BankProfile('generic', None, []))
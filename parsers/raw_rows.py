@@ -0,0 +1,124 @@
+"""
+Raw Rows - Lazy references to the original source rows of parsed transactions
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, Union, Optional, Tuple
+
+import pandas as pd
+
+
+# Number of re-read source tables kept in memory at once
+MAX_LOADED_SOURCES = 4
+
+# Recently loaded source tables, most recently used last
+_loaded_frames: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+
+
+class RawRowSource:
+    """Re-readable origin of raw rows; the table is only loaded when a row is requested"""
+    
+    def __init__(
+        self,
+        source_id: str,
+        loader: Callable[[], pd.DataFrame],
+        file_fingerprint: Optional[Tuple[str, int, int]] = None
+    ):
+        """
+        Initialize a raw row source
+        
+        Args:
+            source_id: Identifier of the source (e.g. file path, size and mtime)
+            loader: Function that re-reads the full source table with the same
+                    row positions as the original parse
+            file_fingerprint: Optional (path, size, mtime in ns) of the source file at
+                              parse time; the file must still match it when it is re-read
+        """
+        self.source_id = source_id
+        self.loader = loader
+        self.file_fingerprint = file_fingerprint
+    
+    @classmethod
+    def for_file(cls, file_path: Union[str, Path], loader: Callable[[], pd.DataFrame]) -> 'RawRowSource':
+        """Create a source identified by a file's path, size and modification time"""
+        stat = os.stat(file_path)
+        fingerprint = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        return cls('{}:{}:{}'.format(*fingerprint), loader, fingerprint)
+    
+    def row(self, row_offset: int) -> Dict[str, Any]:
+        """
+        Materialize one row of the source
+        
+        Args:
+            row_offset: Zero-based position of the row in the source table
+        
+        Returns:
+            Dictionary mapping column names to the original values
+        
+        Raises:
+            ValueError: If the source file was replaced or changed since it was parsed
+        """
+        frame = _loaded_frames.get(self.source_id)
+        if frame is None:
+            self._check_unchanged()
+            frame = self.loader()
+            _loaded_frames[self.source_id] = frame
+            while len(_loaded_frames) > MAX_LOADED_SOURCES:
+                _loaded_frames.popitem(last=False)
+        else:
+            _loaded_frames.move_to_end(self.source_id)
+        
+        return frame.iloc[row_offset].to_dict()
+    
+    def _check_unchanged(self) -> None:
+        """Refuse to re-read a source file whose size or modification time differ from parse time"""
+        if self.file_fingerprint is None:
+            return
+        
+        file_path, size, mtime_ns = self.file_fingerprint
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            raise ValueError(f"Raw rows of {file_path} are no longer available: {e}")
+        
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            raise ValueError(f"Raw rows of {file_path} are no longer available: the file changed since it was parsed")
+
+
+class LazyRawRow(Mapping):
+    """Read-only mapping that stands in for a transaction's raw_data dictionary"""
+    
+    __slots__ = ('source', 'row_offset', '_row')
+    
+    def __init__(self, source: RawRowSource, row_offset: int):
+        self.source = source
+        self.row_offset = row_offset
+        self._row = None
+    
+    @property
+    def source_id(self) -> str:
+        return self.source.source_id
+    
+    def _materialize(self) -> Dict[str, Any]:
+        if self._row is None:
+            self._row = self.source.row(self.row_offset)
+        return self._row
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._materialize()[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+    
+    def __len__(self) -> int:
+        return len(self._materialize())
+    
+    def __repr__(self) -> str:
+        return f'LazyRawRow({self.source_id!r}, {self.row_offset})'
+    
+    def __reduce__(self):
+        # Pickle (e.g. into server-side sessions) as a plain dictionary
+        return (dict, (dict(self._materialize()),))
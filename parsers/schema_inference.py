@@ -0,0 +1,241 @@
+"""
+Schema Inference - Shared column detection for tabular statements (CSV, Excel, PDF tables)
+"""
+
+from collections import OrderedDict
+from typing import List, Any, Optional, Sequence, Tuple, NamedTuple
+
+import pandas as pd
+
+from utils.date_utils import parse_dates
+
+
+# Column name hints, in order of preference
+DATE_NAMES = ['date', 'transaction date', 'posted date']
+DESCRIPTION_NAMES = ['description', 'payee', 'merchant', 'transaction']
+AMOUNT_NAMES = ['amount', 'transaction amount']
+DEBIT_NAMES = ['debit', 'withdrawal', 'money out', 'paid out']
+CREDIT_NAMES = ['credit', 'deposit', 'money in', 'paid in']
+
+# Number of rows scored when inferring columns from their content
+SAMPLE_ROWS = 200
+
+# Minimum content scores for a column to be picked for a role
+MIN_DATE_SCORE = 0.9
+MIN_AMOUNT_SCORE = 0.7
+MIN_DESCRIPTION_LENGTH = 10
+
+# Maximum number of header layouts remembered
+MAX_CACHED_SCHEMAS = 256
+
+# Inferred schemas as column positions by (name hints, header signature), most recently used last
+_schema_cache: 'OrderedDict[Tuple, ColumnSchema]' = OrderedDict()
+
+
+class ColumnSchema(NamedTuple):
+    """Columns holding the date, description and amount of each transaction"""
+    date: Any
+    description: Any
+    amount: Any
+    debit: Any = None   # Set with credit (and amount None) for split debit/credit layouts
+    credit: Any = None
+    
+    @property
+    def amount_columns(self) -> List[Any]:
+        """Source columns that make up the amount"""
+        return [self.amount] if self.amount is not None else [self.debit, self.credit]
+    
+    @property
+    def columns(self) -> List[Any]:
+        """All source columns read to build a transaction"""
+        return [self.date, self.description] + self.amount_columns
+
+
+class SchemaInferer:
+    """Finds the transaction columns of a table by header name, then by sampled content"""
+    
+    def __init__(
+        self,
+        date_names: Sequence[str] = DATE_NAMES,
+        description_names: Sequence[str] = DESCRIPTION_NAMES,
+        amount_names: Sequence[str] = AMOUNT_NAMES,
+        infer_from_content: bool = True
+    ):
+        """
+        Initialize the schema inferer
+        
+        Args:
+            date_names: Header name hints for the date column
+            description_names: Header name hints for the description column
+            amount_names: Header name hints for the amount column
+            infer_from_content: Score column contents when header names are not enough
+        """
+        self.date_names = list(date_names)
+        self.description_names = list(description_names)
+        self.amount_names = list(amount_names)
+        self.infer_from_content = infer_from_content
+    
+    def infer(self, df: pd.DataFrame) -> Optional[ColumnSchema]:
+        """
+        Infer the transaction columns of a DataFrame
+        
+        The result is cached per header signature, so a layout that has been
+        seen before (by any parser sharing the same hints) is not re-inferred.
+        The signature ignores case and surrounding spaces, so cached schemas
+        hold column positions and are mapped back onto this table's names.
+        
+        Args:
+            df: Table with a header row
+        
+        Returns:
+            ColumnSchema, or None if the required columns could not be identified
+        """
+        columns = list(df.columns)
+        key = (self._hints_key(), header_signature(columns))
+        
+        if key in _schema_cache:
+            _schema_cache.move_to_end(key)
+            return ColumnSchema(*(None if pos is None else columns[pos] for pos in _schema_cache[key]))
+        
+        schema = self._infer_uncached(df)
+        
+        # Only remember successful layouts; a failure may be due to an unlucky sample
+        if schema is not None:
+            _schema_cache[key] = ColumnSchema(*(None if col is None else columns.index(col) for col in schema))
+            while len(_schema_cache) > MAX_CACHED_SCHEMAS:
+                _schema_cache.popitem(last=False)
+        
+        return schema
+    
+    def _infer_uncached(self, df: pd.DataFrame) -> Optional[ColumnSchema]:
+        columns = list(df.columns)
+        
+        # Try to identify the columns based on common naming patterns
+        date_col = find_column(columns, self.date_names)
+        desc_col = find_column(columns, self.description_names)
+        amount_col = find_column(columns, self.amount_names)
+        
+        # Banks that export separate debit and credit columns have no single amount column
+        debit_col = credit_col = None
+        if not amount_col:
+            debit_col = find_column(columns, DEBIT_NAMES)
+            credit_col = find_column(columns, CREDIT_NAMES)
+            if not debit_col or not credit_col or debit_col == credit_col:
+                debit_col = credit_col = None
+        
+        # If we couldn't find the essential columns, score the remaining ones on a sample
+        if self.infer_from_content and not all([date_col, desc_col, amount_col or debit_col]):
+            sample = df.head(SAMPLE_ROWS)
+            taken = {date_col, desc_col, amount_col, debit_col, credit_col}
+            candidates = [col for col in columns if col not in taken]
+            
+            if not date_col:
+                date_col = self._best(candidates, sample, date_score, MIN_DATE_SCORE)
+                candidates = [col for col in candidates if col != date_col]
+            if not amount_col and not debit_col:
+                amount_col = self._best(candidates, sample, amount_score, MIN_AMOUNT_SCORE)
+                candidates = [col for col in candidates if col != amount_col]
+            if not desc_col:
+                desc_col = self._best(candidates, sample, description_score, MIN_DESCRIPTION_LENGTH)
+        
+        if debit_col and all([date_col, desc_col]):
+            return ColumnSchema(date_col, desc_col, None, debit_col, credit_col)
+        
+        if not all([date_col, desc_col, amount_col]):
+            return None
+        
+        return ColumnSchema(date_col, desc_col, amount_col)
+    
+    def _best(self, candidates: List[Any], sample: pd.DataFrame, scorer: Any, minimum: float) -> Optional[Any]:
+        """Return the highest scoring candidate column (earliest on ties) if it reaches the minimum"""
+        best_col, best_score = None, None
+        for col in candidates:
+            score = scorer(sample[col])
+            if score > minimum and (best_score is None or score > best_score):
+                best_col, best_score = col, score
+        return best_col
+    
+    def _hints_key(self) -> Tuple:
+        return (
+            tuple(self.date_names),
+            tuple(self.description_names),
+            tuple(self.amount_names),
+            self.infer_from_content
+        )
+
+
+def header_signature(columns: Sequence[Any]) -> Tuple[str, ...]:
+    """Normalized, hashable form of a header row"""
+    return tuple(str(col).strip().lower() for col in columns)
+
+
+def find_column(columns: Sequence[Any], possible_names: Sequence[str]) -> Optional[Any]:
+    """Find a column (or header cell) whose name contains one of the possible names"""
+    for name in possible_names:
+        for col in columns:
+            if isinstance(col, str) and name.lower() in col.lower():
+                return col
+    return None
+
+
+def find_column_index(columns: Sequence[Any], possible_names: Sequence[str]) -> Optional[int]:
+    """Find the position of a header cell whose name contains one of the possible names"""
+    col = find_column(columns, possible_names)
+    return None if col is None else list(columns).index(col)
+
+
+def date_score(series: pd.Series) -> float:
+    """Fraction of non-empty values that parse as dates"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 1.0
+    
+    values = series.dropna()
+    if values.empty or pd.api.types.is_numeric_dtype(values) or _is_numeric_text(values):
+        return 0.0
+    
+    parsed = parse_dates(values.astype(str).tolist())
+    return sum(date is not None for date in parsed) / len(parsed)
+
+
+def amount_score(series: pd.Series) -> float:
+    """
+    Fraction of values that are numeric once currency formatting is removed
+    
+    Money-like values (cents, currency symbols, parentheses) add a small bonus
+    so an amount column wins over an integer reference-number column.
+    """
+    if series.empty:
+        return 0.0
+    
+    if pd.api.types.is_numeric_dtype(series):
+        numeric = series
+        money_like = (series % 1 != 0)
+    else:
+        text = series.astype(str)
+        clean = (
+            text.str.replace(r'[$,\s]', '', regex=True)
+            .str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+        )
+        numeric = pd.to_numeric(clean, errors='coerce')
+        money_like = text.str.contains(r'[$(]|\.\d{2}\b', regex=True)
+    
+    return numeric.notna().mean() + 0.1 * (money_like & numeric.notna()).mean()
+
+
+def description_score(series: pd.Series) -> float:
+    """Average text length of a text column (0 for non-text columns)"""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return 0.0
+    values = series.dropna().astype(str)
+    if values.empty or _is_numeric_text(values):
+        return 0.0
+    return values.str.len().mean()
+
+
+def _is_numeric_text(values: pd.Series) -> bool:
+    """Whether every value of a column read as text (dtype=str) is a plain number"""
+    return bool(pd.to_numeric(values, errors='coerce').notna().all())
+
+
+# Shared inferer for CSV and Excel statements
+default_inferer = SchemaInferer()
@@ -0,0 +1,107 @@
+"""
+Transaction Batch - Columnar container for parsed transactions
+"""
+
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from parsers.raw_rows import RawRowSource, LazyRawRow
+
+
+class TransactionBatch:
+    """Columnar batch of parsed transactions (date, description, amount)"""
+    
+    def __init__(
+        self,
+        dates: Sequence[Any],
+        descriptions: Sequence[str],
+        amounts: Sequence[float],
+        raw_data: Optional[pd.DataFrame] = None,
+        raw_source: Optional[RawRowSource] = None,
+        raw_offsets: Optional[Sequence[int]] = None,
+        rejected_amounts: int = 0
+    ):
+        """
+        Initialize a transaction batch
+        
+        Args:
+            dates: Transaction dates (datetime.date or None)
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts (negative for expenses)
+            raw_data: Optional DataFrame with the original source rows, aligned with the other columns
+            raw_source: Optional source to materialize raw rows from lazily (instead of raw_data)
+            raw_offsets: Row positions in raw_source, aligned with the other columns
+            rejected_amounts: Number of source amounts that could not be parsed (stored as 0.0)
+        """
+        self.frame = pd.DataFrame({
+            'date': pd.Series(list(dates), dtype=object),
+            'description': pd.Series(list(descriptions), dtype=object),
+            'amount': np.asarray(amounts, dtype=float)
+        })
+        self.raw_data = raw_data.reset_index(drop=True) if raw_data is not None else None
+        self.raw_source = raw_source
+        self.raw_offsets = np.asarray(raw_offsets, dtype=np.int64) if raw_offsets is not None else None
+        self.rejected_amounts = rejected_amounts
+    
+    @classmethod
+    def from_dicts(cls, transactions: List[Dict[str, Any]]) -> 'TransactionBatch':
+        """
+        Build a batch from standard transaction dictionaries
+        
+        Args:
+            transactions: List of transaction dictionaries
+        
+        Returns:
+            TransactionBatch with the same transactions
+        """
+        raw_rows = [t.get('raw_data') for t in transactions]
+        raw_data = pd.DataFrame([r or {} for r in raw_rows]) if any(r is not None for r in raw_rows) else None
+        
+        return cls(
+            [t['date'] for t in transactions],
+            [t['description'] for t in transactions],
+            [t['amount'] for t in transactions],
+            raw_data=raw_data
+        )
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+    
+    @property
+    def dates(self) -> pd.Series:
+        return self.frame['date']
+    
+    @property
+    def descriptions(self) -> pd.Series:
+        return self.frame['description']
+    
+    @property
+    def amounts(self) -> pd.Series:
+        return self.frame['amount']
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert the batch to the list-of-dicts format returned by BaseParser.parse
+        
+        Returns:
+            List of standardized transaction dictionaries
+        """
+        columns = [self.frame[col].tolist() for col in self.frame.columns]
+        if self.raw_data is not None:
+            raw_rows = self.raw_data.to_dict('records')
+        elif self.raw_source is not None:
+            # Keep only (source, row offset) references; rows are read back on access
+            raw_rows = [LazyRawRow(self.raw_source, offset) for offset in self.raw_offsets.tolist()]
+        else:
+            raw_rows = None
+        
+        transactions = []
+        for i, values in enumerate(zip(*columns)):
+            transaction = dict(zip(self.frame.columns, values))
+            if raw_rows is not None:
+                transaction['raw_data'] = raw_rows[i]
+            transactions.append(transaction)
+        
+        return transactions
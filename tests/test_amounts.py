@@ -0,0 +1,35 @@
+"""
+Tests for parsers.amounts
+"""
+
+import pandas as pd
+
+from parsers.amounts import normalize_amounts
+
+
+def test_attached_cr_dr_suffixes():
+    amounts, rejected = normalize_amounts(pd.Series(['12.50CR', '12.50DR', '12.50 CR', '1,234.56 dr']))
+    
+    assert amounts.tolist() == [12.5, -12.5, 12.5, -1234.56]
+    assert rejected == 0
+
+
+def test_spaced_currency_and_parentheses():
+    amounts, rejected = normalize_amounts(pd.Series(['$ (3.00)', '( 3.00 )', '$1,234.50', '12.50-']))
+    
+    assert amounts.tolist() == [-3.0, -3.0, 1234.5, -12.5]
+    assert rejected == 0
+
+
+def test_decimal_comma_with_suffix():
+    amounts, rejected = normalize_amounts(pd.Series(['1.234,56CR', '€ (3,00)']), decimal=',')
+    
+    assert amounts.tolist() == [1234.56, -3.0]
+    assert rejected == 0
+
+
+def test_unparseable_values_are_rejected():
+    amounts, rejected = normalize_amounts(pd.Series(['ACR', 'n/a', None, '']))
+    
+    assert amounts.tolist() == [0.0, 0.0, 0.0, 0.0]
+    assert rejected == 2
@@ -0,0 +1,47 @@
+"""
+Tests for deduplication in analysis.spending_analyzer
+"""
+
+import datetime
+
+import pytest
+
+from analysis.category_cache import CategoryCache
+from analysis.spending_analyzer import SpendingAnalyzer
+
+
+def _coffee(**extra):
+    return dict({'date': datetime.date(2024, 3, 1), 'description': 'Blue Bottle Coffee', 'amount': -4.5}, **extra)
+
+
+@pytest.fixture
+def analyzer():
+    return SpendingAnalyzer(dedup_window_days=1, category_cache=CategoryCache())
+
+
+def test_same_statement_repeats_are_kept(analyzer):
+    analysis = analyzer.analyze([_coffee(), _coffee()])
+    
+    assert len(analysis['transactions']) == 2
+
+
+def test_copies_from_other_statements_are_dropped(analyzer):
+    analysis = analyzer.analyze([_coffee(source='march.csv'), _coffee(source='march.csv'), _coffee(source='q1.csv')])
+    
+    assert len(analysis['transactions']) == 2
+
+
+def test_append_keeps_repeats_of_the_same_statement(analyzer):
+    analysis = analyzer.analyze([_coffee()])
+    
+    assert len(analyzer.append(analysis, [_coffee()])['transactions']) == 2
+    assert len(analyzer.append(analysis, [_coffee()], source='export.csv')['transactions']) == 1
+
+
+def test_append_keeps_the_source_of_analyze(analyzer):
+    analysis = analyzer.analyze([_coffee()], source='checking.csv')
+    
+    assert analysis['source'] == 'checking.csv'
+    assert len(analyzer.append(analysis, [_coffee()], source='checking.csv')['transactions']) == 2
+    assert len(analyzer.append(analysis, [_coffee()])['transactions']) == 2
+    assert len(analyzer.append(analysis, [_coffee()], source='savings.csv')['transactions']) == 1
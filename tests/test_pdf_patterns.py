@@ -0,0 +1,41 @@
+"""
+Tests for parsers.pdf_patterns
+"""
+
+import datetime
+
+from parsers.pdf_parser import PDFParser
+from parsers.pdf_patterns import get_bank_profile
+
+
+def parse_text(text):
+    parser = PDFParser()
+    return parser._normalize_amounts(parser._parse_text_lines(text, get_bank_profile('generic')))
+
+
+def test_trailing_cr_dr_marker():
+    transactions = parse_text(
+        "01/17/2024 AMAZON MKTPLACE 25.99 CR\n"
+        "01/18/2024 AMAZON MKTPLACE 25.99DR\n"
+    )
+    
+    assert [t['amount'] for t in transactions] == [25.99, -25.99]
+    assert transactions[0]['description'] == 'AMAZON MKTPLACE'
+
+
+def test_trailing_currency_code():
+    transactions = parse_text(
+        "01/18/2024 Grocery Store -45.67 USD\n"
+        "2024-01-19 Hotel Paris 120.00 EUR\n"
+    )
+    
+    assert [(t['date'], t['description'], t['amount']) for t in transactions] == [
+        (datetime.date(2024, 1, 18), 'Grocery Store', -45.67),
+        (datetime.date(2024, 1, 19), 'Hotel Paris', 120.0),
+    ]
+
+
+def test_marker_after_running_balance():
+    transactions = parse_text("01/20/2024 Payroll 1,500.00 CR 2,345.67 CR\n")
+    
+    assert [(t['description'], t['amount']) for t in transactions] == [('Payroll', 1500.0)]
@@ -4,10 +4,40 @@ Date Utilities - Helper functions for date parsing and manipulation
 
 import re
 import datetime
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Optional, Union, Iterable, List, Dict, Any
 from dateutil import parser as date_parser
 
 
+# Candidate strptime formats for statement date columns, in order of preference.
+# Month-first formats come before day-first ones so ambiguous columns keep the
+# US interpretation used by parse_date.
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%m/%d/%y',
+    '%d/%m/%y',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%b %d %Y',
+    '%B %d %Y',
+    '%d %b %Y',
+    '%d %B %Y',
+    '%d-%b-%Y',
+    '%Y%m%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+]
+
+# Number of distinct values inspected when inferring a column's date format
+FORMAT_SAMPLE_SIZE = 200
+
+
 def parse_date(date_str: str) -> Optional[datetime.date]:
     """
     Parse a date string into a datetime.date object
@@ -22,8 +52,107 @@ def parse_date(date_str: str) -> Optional[datetime.date]:
         return None
     
     # Clean the date string
-    date_str = date_str.strip()
+    return _parse_date_cached(date_str.strip())
+
+
+def parse_dates(values: Iterable[Any], formats: Optional[List[str]] = None) -> List[Optional[datetime.date]]:
+    """
+    Parse a column of date strings in bulk
+    
+    The column is sampled once to infer a small set of fixed strptime formats,
+    each distinct string is parsed only once, and values that match none of
+    the inferred formats fall back to parse_date.
+    
+    Args:
+        values: Iterable of date strings (non-strings parse to None)
+        formats: Optional list of strptime formats to use instead of inferring them
+    
+    Returns:
+        List of datetime.date objects (or None) aligned with the input values
+    """
+    values = list(values)
+    distinct = {v.strip() for v in values if isinstance(v, str) and v.strip()}
+    
+    if formats is None:
+        formats = infer_date_formats(distinct)
+    
+    parsed: Dict[str, Optional[datetime.date]] = {}
+    for value in distinct:
+        parsed[value] = _parse_with_formats(value, formats) or parse_date(value)
+    
+    return [parsed.get(v.strip()) if isinstance(v, str) else None for v in values]
+
+
+def infer_date_formats(
+    values: Iterable[str],
+    sample_size: int = FORMAT_SAMPLE_SIZE,
+    max_formats: int = 3
+) -> List[str]:
+    """
+    Infer the strptime formats used by a column of date strings
     
+    Formats are picked greedily: the candidate that parses the most sampled
+    values first, then the one covering most of what is left, and so on.
+    
+    Args:
+        values: Date strings to sample from
+        sample_size: Maximum number of distinct values to inspect
+        max_formats: Maximum number of formats to return
+    
+    Returns:
+        List of strptime formats, best match first (empty if none match)
+    """
+    sample = []
+    seen = set()
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        value = value.strip()
+        if value and value not in seen:
+            seen.add(value)
+            sample.append(value)
+            if len(sample) >= sample_size:
+                break
+    
+    # Record which sampled values each candidate format can parse
+    matches = {
+        fmt: {value for value in sample if _strptime_date(value, fmt) is not None}
+        for fmt in DATE_FORMATS
+    }
+    
+    formats = []
+    remaining = set(sample)
+    while remaining and len(formats) < max_formats:
+        best = max(DATE_FORMATS, key=lambda fmt: len(matches[fmt] & remaining))
+        covered = matches[best] & remaining
+        if not covered:
+            break
+        formats.append(best)
+        remaining -= covered
+    
+    return formats
+
+
+def _parse_with_formats(date_str: str, formats: List[str]) -> Optional[datetime.date]:
+    """Parse a date string with the first matching format, or None"""
+    for fmt in formats:
+        date = _strptime_date(date_str, fmt)
+        if date is not None:
+            return date
+    return None
+
+
+def _strptime_date(date_str: str, fmt: str) -> Optional[datetime.date]:
+    """Parse a date string with a fixed strptime format, or None"""
+    try:
+        return datetime.datetime.strptime(date_str, fmt).date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_date_cached(date_str: str) -> Optional[datetime.date]:
+    """Parse a stripped date string, memoized per distinct string"""
     # Try common date formats
     try:
         # Try dateutil parser first (handles many formats)
@@ -0,0 +1,65 @@
+"""
+File Utilities - Helper functions for writing cache files safely and keeping them bounded
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = 'w', encoding: Optional[str] = None) -> Iterator[IO]:
+    """
+    Open a temporary file next to path and move it into place once writing succeeded
+    
+    Readers see either the old file or the complete new one, never a partial
+    write. If writing fails, the temporary file is removed and the error is
+    re-raised.
+    
+    Args:
+        path: Destination file
+        mode: File mode ('w' or 'wb')
+        encoding: Text encoding (text mode only)
+    
+    Yields:
+        Open file object to write to
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def evict_least_recently_used(directory: Union[str, Path], pattern: str, max_bytes: int) -> None:
+    """
+    Delete the least recently used files matching pattern until they fit in max_bytes
+    
+    Files are ordered by modification time, so caches mark an entry as used
+    by touching it (os.utime) when they serve it.
+    
+    Args:
+        directory: Cache directory
+        pattern: Glob pattern of the cache entries (e.g. '*.txt')
+        max_bytes: Total size budget of the matching files
+    """
+    entries = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size